@@ -209,6 +209,74 @@ for error in bad_data:
     print(f"  {error}")
 
 
+# -----------------------------------------------------------------------------
+# COLUMN-WISE VALIDATION - same answers, whole columns at a time
+# -----------------------------------------------------------------------------
+# process_records() runs int()/float() inside a try/except for every record.
+# process_records_columns() checks whole columns instead:
+#   1. Turn the records into columns (one DataFrame; a missing key becomes NaN)
+#   2. pd.to_numeric(..., errors='coerce') converts a whole column in one call -
+#      anything unparseable becomes NaN instead of raising
+#   3. The NaNs (and anything int() might not accept) make a bad-row mask
+#   4. Only the bad rows go through process_records(), so they get exactly the
+#      loop's error messages (and the odd valid-but-unusual value is rescued)
+#
+# Laravel parallel: validating a whole CSV import with one query instead of
+# calling Validator::make() per row.
+import numpy as np
+import pandas as pd
+
+
+def process_records_columns(records):
+    """Same (results, errors) as process_records(), validated column by column."""
+    if not all(isinstance(record, dict) for record in records):
+        return process_records(records)         # Not records we can turn into columns
+
+    df = pd.DataFrame.from_records(records, columns=['name', 'age', 'score'])
+    age = pd.to_numeric(df['age'], errors='coerce')        # 'twenty' -> NaN, no exception
+    score = pd.to_numeric(df['score'], errors='coerce')
+
+    # int() only takes whole numbers: plain digit strings up to 15 long go the fast way
+    age_text = df['age'].astype(str)                       # None / NaN -> 'None' / 'nan': not digits
+    whole = age_text.str.isdecimal() & (age_text.str.len() <= 15)
+    ok = (df['name'].notna() & whole & age.notna() & score.notna()).to_numpy()
+
+    # Convert the good rows like int() / float() do (float() is exact; to_numeric can be 1 ulp off)
+    rows = {}
+    good_scores = np.asarray(df.loc[ok, 'score'].astype(str), dtype=str).astype(float)
+    for i, name, a, sc in zip(np.flatnonzero(ok).tolist(), df.loc[ok, 'name'].tolist(),
+                              age[ok].astype(np.int64).tolist(), good_scores.tolist()):
+        rows[i] = {'name': name, 'age': a, 'score': sc}
+
+    # Bad rows: the original loop decides, with its own error messages
+    errors = []
+    for i in np.flatnonzero(~ok).tolist():
+        result, error = process_records([records[i]])
+        if result:
+            rows[i] = result[0]
+        else:
+            errors.append(error[0].replace('Record 0:', f'Record {i}:', 1))
+    return [rows[i] for i in sorted(rows)], errors
+
+
+# Both paths must agree - on the messy data above and on a bigger messy batch
+import random
+
+random.seed(42)
+batch = [{'name': f'sensor_{i}', 'age': str(random.randint(1, 400)),
+          'score': f'{random.uniform(0, 100):.1f}'} for i in range(10_000)]
+for i, bad_value in zip(range(0, 10_000, 250), ['unknown', '', None, '30.5', ' 42 ', '1e3']*7):
+    batch[i]['age'] = bad_value
+del batch[7]['score']
+
+for name, data in [('messy records', records), ('10,000 records', batch)]:
+    print(f"\nColumns == loop on {name}: {process_records_columns(data) == process_records(data)}")
+# Speed: on a list of dicts the loop still wins (~4x on a million records,
+# phase6_project/benchmarks/bench_error_handling.py) - building the columns
+# costs more than int()/float() do. Column-wise pays off when the data already
+# arrives as columns (pd.read_csv, a DataFrame): skip step 1 and keep the mask.
+
+
 # -----------------------------------------------------------------------------
 # QUICK REFERENCE
 # -----------------------------------------------------------------------------
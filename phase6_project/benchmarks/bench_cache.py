@@ -0,0 +1,72 @@
+"""
+Benchmark: rebuilding X / y from the CSV vs loading them from FeatureCache.
+
+Usage (from phase6_project/):
+    python benchmarks/bench_cache.py                      # 2M rows
+    python benchmarks/bench_cache.py --rows 10000000 --max-mb 4096
+
+"Rebuild" is what every notebook run does today: pd.read_csv, encode,
+engineer features, split. The first cached run pays that plus the write;
+later runs only fingerprint the inputs and memory-map the arrays. Touching
+the data file must trigger a rebuild.
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from water_filter import (add_engineered_features, current_rss_mb, encode_readings,  # noqa: E402
+                          split_features, write_readings_csv)
+from water_filter.cache import FeatureCache                                # noqa: E402
+from water_filter.generator import READINGS_PER_FILTER                     # noqa: E402
+
+
+def timed(func):
+    start = time.perf_counter()
+    result = func()
+    return result, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--rows', type=int, default=2_000_000)
+    parser.add_argument('--max-mb', type=float, default=2048)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as workdir:
+        path = Path(workdir) / 'readings.csv'
+        write_readings_csv(path, args.rows // READINGS_PER_FILTER, verbose=False)
+
+        def build():
+            return split_features(add_engineered_features(encode_readings(pd.read_csv(path))))
+
+        cache = FeatureCache(Path(workdir) / 'cache', max_mb=args.max_mb)
+        (X, y), rebuild_s = timed(build)
+        _, first_s = timed(lambda: cache.load_or_build(path, build))
+        rss_before = current_rss_mb()
+        (X_hit, y_hit), hit_s = timed(lambda: cache.load_or_build(path, build))
+        rss_growth = current_rss_mb() - rss_before
+        same = X.equals(X_hit) and y.equals(y_hit)
+        os.utime(path)
+        _, touched_s = timed(lambda: cache.load_or_build(path, build))
+        report = cache.report()
+
+    print(f"{len(X):,} rows x {X.shape[1]} features\n")
+    print(f"rebuild from CSV:         {rebuild_s:8.3f} s")
+    print(f"first run (build + save): {first_s:8.3f} s")
+    print(f"cached run:               {hit_s:8.3f} s   ({rebuild_s / hit_s:,.0f}x faster, "
+          f"RSS +{rss_growth:.1f} MB - memory-mapped)")
+    print(f"after touching the CSV:   {touched_s:8.3f} s   (rebuilt: {report['misses'] == 2})")
+    print(f"identical X / y:          {same}")
+    print(f"\nReport: {report}")
+
+
+if __name__ == '__main__':
+    main()
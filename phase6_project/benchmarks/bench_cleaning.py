@@ -0,0 +1,92 @@
+"""
+Benchmark: lesson-style cleaning (per-row .str + .apply) vs CleaningPipeline.
+
+Usage (from phase6_project/):
+    python benchmarks/bench_cleaning.py                   # 1M rows, 20 per filter
+    python benchmarks/bench_cleaning.py --rows 5000000 --chunksize 250000
+    python benchmarks/bench_cleaning.py --ids 950000      # nearly one row per filter
+
+Builds a messy vendor export like the one in phase3_pandas/07_data_cleaning:
+mixed-case IDs with duplicates, padded / mis-cased regions and statuses, TDS
+as text with the odd unparseable value. Both versions read the same CSV.
+"""
+
+import argparse
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from water_filter.cleaning import CleaningPipeline, normalize_column_names  # noqa: E402
+
+
+def messy_export(rows, ids, seed=42):
+    rng = np.random.default_rng(seed)
+    ids = np.char.add('wf', np.char.zfill(rng.integers(0, ids, rows).astype(str), 7))
+    ids = np.where(rng.random(rows) < 0.5, np.char.upper(ids), ids)
+    regions = np.array(['  North ', 'north', 'NORTH', 'South', ' south', 'East ', 'EAST', 'west', 'West'])
+    statuses = np.array(['active', 'Active', 'ACTIVE ', 'inactive', ' Inactive'])
+    tds = np.round(rng.uniform(10, 200, rows), 1).astype(str)
+    tds[rng.random(rows) < 0.001] = 'n/a'
+    return pd.DataFrame({
+        'Filter ID': ids,
+        'TDS Output ': tds,
+        'Region  ': regions[rng.integers(0, len(regions), rows)],
+        'status': statuses[rng.integers(0, len(statuses), rows)],
+    })
+
+
+def lesson_clean(path):
+    """The notebook's steps, verbatim, on the whole file."""
+    df = pd.read_csv(path, dtype=str)
+    df.columns = normalize_column_names(df.columns)
+    df['filter_id'] = df['filter_id'].str.upper()
+    df['region'] = df['region'].str.strip().str.title()
+    df['status'] = df['status'].str.strip().str.lower()
+    df['tds_output'] = pd.to_numeric(df['tds_output'], errors='coerce')
+    df = df.drop_duplicates(subset='filter_id', keep='first')
+    df['tds_category'] = df['tds_output'].apply(
+        lambda x: 'Safe' if x < 80 else 'Warning' if x < 120 else 'Danger'
+    )
+    return df
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--rows', type=int, default=1_000_000)
+    parser.add_argument('--chunksize', type=int, default=500_000)
+    parser.add_argument('--ids', type=int, default=None,
+                        help='distinct filter IDs in the export (default: rows / 20)')
+    args = parser.parse_args()
+    ids = args.ids or max(1, args.rows // 20)
+
+    with tempfile.TemporaryDirectory() as workdir:
+        path = Path(workdir) / 'export.csv'
+        messy_export(args.rows, ids).to_csv(path, index=False)
+
+        start = time.perf_counter()
+        expected = lesson_clean(path)
+        lesson_s = time.perf_counter() - start
+
+        pipeline = CleaningPipeline()
+        start = time.perf_counter()
+        chunks = list(pipeline.clean_csv(path, args.chunksize))
+        pipeline_s = time.perf_counter() - start
+
+    cleaned = pd.concat([c.astype({col: object for col in c.select_dtypes('category')}) for c in chunks])
+    same = all(cleaned[col].astype(str).tolist() == expected[col].astype(str).tolist()
+               for col in expected.columns)
+    print(f"{args.rows:,} rows, {ids:,} filter IDs, chunks of {args.chunksize:,}\n")
+    print(f"lesson (.str per row + apply): {lesson_s:7.2f} s  ({args.rows / lesson_s:>12,.0f} rows/s)")
+    print(f"CleaningPipeline:              {pipeline_s:7.2f} s  ({args.rows / pipeline_s:>12,.0f} rows/s)")
+    print(f"Speedup: {lesson_s / pipeline_s:.1f}x   identical output: {same}")
+    print(f"\nReport: {pipeline.report()}")
+
+
+if __name__ == '__main__':
+    main()
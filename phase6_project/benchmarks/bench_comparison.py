@@ -0,0 +1,71 @@
+"""
+Benchmark: Step 6 model comparison, notebook loop vs compare_models() workers.
+
+Usage (from phase6_project/):
+    python benchmarks/bench_comparison.py                 # 100k rows, one worker per model
+    python benchmarks/bench_comparison.py --rows 1000000 --workers 4
+
+The loop is the notebook's `for name, model in models.items()`. The parallel
+run fits each model in its own process over shared-memory arrays. Speedup is
+bounded by the slowest model (Gradient Boosting) and by the number of cores:
+on a single core the workers just take turns.
+"""
+
+import argparse
+import os
+import sys
+import time
+from pathlib import Path
+
+import pandas as pd
+from sklearn.model_selection import train_test_split
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from water_filter import (add_engineered_features, encode_readings, generate_readings,  # noqa: E402
+                          make_models, split_features)
+from water_filter.comparison import METRICS, compare_models               # noqa: E402
+from water_filter.generator import READINGS_PER_FILTER                     # noqa: E402
+from water_filter.profiling import PeakRSS                                 # noqa: E402
+
+
+def notebook_loop(X_train, y_train, X_test, y_test):
+    results = []
+    for name, model in make_models().items():
+        model.fit(X_train, y_train)
+        y_pred = model.predict(X_test)
+        results.append({'Model': name, **{metric: score(y_test, y_pred)
+                                          for metric, score in METRICS.items()}})
+    return pd.DataFrame(results).set_index('Model').round(3)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--rows', type=int, default=100_000)
+    parser.add_argument('--workers', type=int, default=None)
+    args = parser.parse_args()
+
+    df = generate_readings(args.rows // READINGS_PER_FILTER, READINGS_PER_FILTER)
+    X, y = split_features(add_engineered_features(encode_readings(df)))
+    X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=0.2, random_state=42, stratify=y)
+    print(f"{len(X_train):,} training rows, {os.cpu_count()} CPU(s)\n")
+
+    with PeakRSS() as memory:
+        start = time.perf_counter()
+        expected = notebook_loop(X_train, y_train, X_test, y_test)
+        loop_s = time.perf_counter() - start
+    print(f"notebook loop:   {loop_s:7.2f} s   (RSS +{memory.growth_mb:.0f} MB)")
+
+    start = time.perf_counter()
+    results_df = compare_models(make_models(), X_train, y_train, X_test, y_test, workers=args.workers)
+    parallel_s = time.perf_counter() - start
+    print(f"compare_models:  {parallel_s:7.2f} s   ({loop_s / parallel_s:.2f}x)\n")
+
+    print(results_df.to_string())
+    print(f"\nsame metrics as the loop: {expected.equals(results_df[list(METRICS)])}")
+    print(f"sum of fit times: {results_df['Fit (s)'].sum():.2f} s, "
+          f"slowest model: {results_df['Fit (s)'].max():.2f} s (the best parallel wall time)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,86 @@
+"""
+Benchmark: dashboard roll-ups from raw readings (groupby) vs from AggregateCube.
+
+Usage (from phase6_project/):
+    python benchmarks/bench_cube.py                       # 5M rows
+    python benchmarks/bench_cube.py --rows 20000000 --chunksize 1000000
+
+The cube is built chunk by chunk, as readings would be appended. Each query
+is then answered twice: groupby(...).agg(...) over the raw DataFrame, and
+cube.rollup(...). Means, min/max and rates must match; filter counts are
+HyperLogLog estimates and are reported as relative error.
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from water_filter import generate_readings                                 # noqa: E402
+from water_filter.cube import AggregateCube                                # noqa: E402
+from water_filter.generator import READINGS_PER_FILTER                     # noqa: E402
+
+
+QUERIES = [
+    ('region', {}),
+    ('month', {}),
+    (['region', 'month'], {}),
+    (['month', 'membrane_status'], {'region': 'North'}),
+    (['region', 'month', 'membrane_status'], {}),
+]
+
+
+def pandas_rollup(df, by, where):
+    for dim, label in where.items():
+        df = df[df[dim] == label]
+    return df.groupby(by, observed=True).agg(
+        readings=('tds_output', 'size'), filters=('filter_id', 'nunique'),
+        tds_output_mean=('tds_output', 'mean'), tds_output_max=('tds_output', 'max'),
+        maintenance_needed_mean=('maintenance_needed', 'mean'))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--rows', type=int, default=5_000_000)
+    parser.add_argument('--chunksize', type=int, default=500_000)
+    args = parser.parse_args()
+
+    df = generate_readings(args.rows // READINGS_PER_FILTER, READINGS_PER_FILTER, seed=1)
+    df = df.astype({'region': str, 'membrane_status': str})
+    df['month'] = df['reading_date'].dt.to_period('M')
+
+    cube = AggregateCube()
+    start = time.perf_counter()
+    for begin in range(0, len(df), args.chunksize):
+        cube.update(df.iloc[begin:begin + args.chunksize])
+    build_s = time.perf_counter() - start
+    size_mb = (cube.readings.nbytes + cube.registers.nbytes
+               + sum(a.nbytes for a in cube.totals.values())) / 1024 ** 2
+    print(f"{len(df):,} rows -> cube of {'x'.join(map(str, cube.shape))} cells, {size_mb:.1f} MB")
+    print(f"build: {build_s:.2f} s ({len(df) / build_s:,.0f} rows/s, chunks of {args.chunksize:,})\n")
+
+    print(f"{'query':<58} {'groupby':>10} {'cube':>10}   exact   filters err")
+    for by, where in QUERIES:
+        start = time.perf_counter()
+        expected = pandas_rollup(df, by, where)
+        pandas_s = time.perf_counter() - start
+        start = time.perf_counter()
+        result = cube.rollup(by, where=where)
+        cube_s = time.perf_counter() - start
+
+        expected = expected.reindex(result.index)
+        exact = (np.array_equal(result['readings'], expected['readings'])
+                 and np.allclose(result['tds_output_mean'], expected['tds_output_mean'])
+                 and np.array_equal(result['tds_output_max'], expected['tds_output_max'])
+                 and np.allclose(result['maintenance_needed_mean'], expected['maintenance_needed_mean']))
+        error = np.abs(result['filters'] / expected['filters'] - 1).max()
+        name = f"{by}" + (f" where {where}" if where else "")
+        print(f"{name:<58} {pandas_s * 1e3:>8.1f}ms {cube_s * 1e3:>8.1f}ms   {str(exact):<7} {error:.1%}")
+
+
+if __name__ == '__main__':
+    main()
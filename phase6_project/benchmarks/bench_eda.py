@@ -0,0 +1,76 @@
+"""
+Benchmark: notebook EDA on a loaded DataFrame vs one chunked pass (EDASummary).
+
+Usage (from phase6_project/):
+    python benchmarks/bench_eda.py                        # 5M rows
+    python benchmarks/bench_eda.py --rows 20000000 --chunksize 1000000
+
+Both versions start from the CSV on disk. The pandas version loads it with
+load_readings_csv (already the compact dtypes) and runs describe(), corr(),
+value_counts() and the two groupby rates. Peak memory is the largest amount
+allocated at once during each run (tracemalloc).
+"""
+
+import argparse
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from water_filter import load_readings_csv, write_readings_csv                # noqa: E402
+from water_filter.eda import summarize_csv                                 # noqa: E402
+from water_filter.generator import READINGS_PER_FILTER                     # noqa: E402
+
+
+def pandas_eda(path):
+    df = load_readings_csv(path)
+    numeric_cols = df.select_dtypes(include=[np.number]).columns
+    return (df[numeric_cols].describe(), df[numeric_cols].corr(),
+            df['maintenance_needed'].value_counts(),
+            df.groupby('membrane_status', observed=True)['maintenance_needed'].mean(),
+            df.groupby('region', observed=True)['maintenance_needed'].mean())
+
+
+def measure(name, func):
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = func()
+    seconds = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"{name:<10} {seconds:8.2f} s   peak {peak / 1024 ** 2:>9,.1f} MB")
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--rows', type=int, default=5_000_000)
+    parser.add_argument('--chunksize', type=int, default=500_000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as workdir:
+        path = Path(workdir) / 'readings.csv'
+        write_readings_csv(path, args.rows // READINGS_PER_FILTER, verbose=False)
+        print(f"{args.rows:,} rows, chunks of {args.chunksize:,}\n")
+
+        describe, corr, counts, by_status, by_region = measure('pandas', lambda: pandas_eda(path))
+        summary = measure('one pass', lambda: summarize_csv(path, args.chunksize))
+
+    quartiles = ['25%', '50%', '75%']
+    exact = summary.describe().drop(index=quartiles) - describe.drop(index=quartiles)
+    approx = (summary.describe().loc[quartiles] - describe.loc[quartiles]).abs() / describe.loc[quartiles].abs()
+    print(f"\nmax |diff| count/mean/std/min/max:  {np.nanmax(exact.abs().to_numpy()):.2e}")
+    print(f"max relative error of quartiles:    {np.nanmax(approx.replace(np.inf, np.nan).to_numpy()):.2%}")
+    print(f"max |diff| correlation:             {np.abs(summary.corr() - corr).to_numpy().max():.2e}")
+    print(f"value counts equal:                 {summary.value_counts('maintenance_needed').sort_index().equals(counts.sort_index())}")
+    print(f"max |diff| group rates:             "
+          f"{max(np.abs(summary.group_rate('membrane_status') - by_status).max(), np.abs(summary.group_rate('region') - by_region).max()):.2e}")
+
+
+if __name__ == '__main__':
+    main()
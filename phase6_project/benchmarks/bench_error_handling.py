@@ -0,0 +1,55 @@
+"""
+Benchmark: phase1_python/06_error_handling - per-record loop vs column-wise validation.
+
+Usage (from phase6_project/):
+    python benchmarks/bench_error_handling.py             # 1M records, 0.5% bad ages
+    python benchmarks/bench_error_handling.py --records 5000000
+
+Times process_records() against process_records_columns() (the tutorial's
+functions, loaded from the script) on the same list of dicts, and checks
+both return the same good rows and the same error messages.
+"""
+
+import argparse
+import contextlib
+import io
+import random
+import runpy
+import time
+from pathlib import Path
+
+TUTORIAL = Path(__file__).resolve().parents[2] / 'phase1_python' / '06_error_handling.py'
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--records', type=int, default=1_000_000)
+    parser.add_argument('--bad-every', type=int, default=200, help='every n-th record gets a bad age')
+    args = parser.parse_args()
+
+    with contextlib.redirect_stdout(io.StringIO()):     # The tutorial prints its lessons
+        tutorial = runpy.run_path(str(TUTORIAL))
+    process_records, process_records_columns = tutorial['process_records'], tutorial['process_records_columns']
+
+    random.seed(42)
+    records = [{'name': f'sensor_{i}', 'age': str(random.randint(1, 400)),
+                'score': f'{random.uniform(0, 100):.1f}'} for i in range(args.records)]
+    for i in range(0, args.records, args.bad_every):
+        records[i]['age'] = 'unknown'
+    print(f"{args.records:,} records, {len(range(0, args.records, args.bad_every)):,} bad\n")
+
+    start = time.perf_counter()
+    expected = process_records(records)
+    loop_s = time.perf_counter() - start
+
+    start = time.perf_counter()
+    result = process_records_columns(records)
+    columns_s = time.perf_counter() - start
+
+    print(f"process_records (loop)     {loop_s:7.2f} s  ({args.records / loop_s:>12,.0f} records/s)")
+    print(f"process_records_columns    {columns_s:7.2f} s  ({args.records / columns_s:>12,.0f} records/s)")
+    print(f"Speedup: {loop_s / columns_s:.2f}x   same results and errors: {result == expected}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,72 @@
+"""
+Benchmark: Step 5 feature engineering, pandas vs the fused FeatureKernel.
+
+Usage (from phase6_project/):
+    python benchmarks/bench_features.py                   # 5M rows
+    python benchmarks/bench_features.py --rows 10000000 --block-rows 131072
+
+Both versions start from the encoded readings. The pandas version is the
+notebook code (df.copy() + four column assignments); the kernel writes the
+same four features into one preallocated array. Peak memory is the extra
+memory allocated during the call (tracemalloc), on top of the input.
+"""
+
+import argparse
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from water_filter import generate_readings                                   # noqa: E402
+from water_filter.features import ENGINEERED_FEATURES, FeatureKernel          # noqa: E402
+from water_filter.generator import READINGS_PER_FILTER                       # noqa: E402
+from water_filter.pipeline import add_engineered_features, encode_readings   # noqa: E402
+
+
+def measure(name, func, rows, repeats):
+    """Best-of-N time and tracemalloc peak of one version; returns its result."""
+    times = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        result = func()
+        times.append(time.perf_counter() - start)
+        del result
+
+    tracemalloc.start()
+    result = func()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    best = min(times)
+    print(f"{name:<8} {best:8.3f} s  {rows / best:>14,.0f} rows/s  peak {peak / 1024 ** 2:>8,.1f} MB")
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--rows', type=int, default=5_000_000)
+    parser.add_argument('--block-rows', type=int, default=None)
+    parser.add_argument('--repeats', type=int, default=3)
+    args = parser.parse_args()
+
+    df = encode_readings(generate_readings(args.rows // READINGS_PER_FILTER, READINGS_PER_FILTER))
+    rows = len(df)
+    columns = {c: df[c].to_numpy() for c in df.columns}
+    kernel = FeatureKernel(args.block_rows) if args.block_rows else FeatureKernel()
+    out = np.empty((rows, len(ENGINEERED_FEATURES)))
+    print(f"{rows:,} rows, kernel block {kernel.block_rows:,} rows\n")
+
+    expected = measure('pandas', lambda: add_engineered_features(df.copy()), rows, args.repeats)
+    measure('kernel', lambda: kernel(columns, out=out), rows, args.repeats)
+
+    same = np.array_equal(expected[ENGINEERED_FEATURES].to_numpy(np.float64), out)
+    print(f"\nIdentical values: {same}")
+    print(f"Kernel report: {kernel.report()}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,69 @@
+"""
+Benchmark: re-running a tweaked grid search - GridSearchCV vs cached fold scores.
+
+Usage (from phase6_project/):
+    python benchmarks/bench_foldcache.py                  # Step 7's grid, then max_depth + [20]
+    python benchmarks/bench_foldcache.py --rows 20000 --add-depth 8
+
+The first search fills a FoldCache (cache.py) in a temporary directory.
+Then one max_depth value is added to the grid, as you would between two
+notebook runs, and the new grid runs twice: GridSearchCV from scratch, and
+CachedGridSearch (tuning.py) taking the unchanged folds from the cache.
+Prints wall time, hits / misses, and whether both give the same scores.
+"""
+
+import argparse
+import sys
+import tempfile
+import time
+import warnings
+from pathlib import Path
+
+import numpy as np
+from sklearn.model_selection import train_test_split
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from water_filter import (FoldCache, add_engineered_features, encode_readings,  # noqa: E402
+                          generate_readings, split_features)
+from water_filter.generator import READINGS_PER_FILTER                     # noqa: E402
+from water_filter.tuning import PARAM_GRID, tune_random_forest            # noqa: E402
+
+
+def run(name, X_train, y_train, **options):
+    start = time.perf_counter()
+    search, _ = tune_random_forest(X_train, y_train, method='grid', **options)
+    print(f"{name:<34} {time.perf_counter() - start:8.1f} s")
+    return search
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--rows', type=int, default=10_000)
+    parser.add_argument('--add-depth', type=int, default=20, help='max_depth value added to the grid')
+    args = parser.parse_args()
+    warnings.filterwarnings('ignore')
+
+    df = generate_readings(args.rows // READINGS_PER_FILTER, READINGS_PER_FILTER)
+    X, y = split_features(add_engineered_features(encode_readings(df)))
+    X_train, _, y_train, _ = train_test_split(X, y, test_size=0.2, random_state=42, stratify=y)
+    tweaked = {**PARAM_GRID, 'max_depth': PARAM_GRID['max_depth'] + [args.add_depth]}
+    print(f"{len(X_train):,} training rows, max_depth {PARAM_GRID['max_depth']} -> {tweaked['max_depth']}\n")
+
+    with tempfile.TemporaryDirectory() as root:
+        folds = FoldCache(root)
+        run('first run, filling the cache', X_train, y_train, cache=folds)
+        print(f"  {folds.report()}\n")
+        folds.hits = folds.misses = 0
+
+        plain = run('tweaked grid, GridSearchCV', X_train, y_train, param_grid=tweaked)
+        cached = run('tweaked grid, cached folds', X_train, y_train, param_grid=tweaked, cache=folds)
+        print(f"  {folds.report()}")
+
+    same = (np.array_equal(plain.cv_results_['mean_test_score'], cached.cv_results_['mean_test_score'])
+            and plain.best_params_ == cached.best_params_)
+    print(f"\nidentical CV scores and winner: {same}")
+
+
+if __name__ == '__main__':
+    main()
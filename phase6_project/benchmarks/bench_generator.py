@@ -0,0 +1,130 @@
+"""
+Benchmark: notebook loop generator vs vectorized generator.
+
+Usage (from phase6_project/):
+    python benchmarks/bench_generator.py                 # 10M rows
+    python benchmarks/bench_generator.py --rows 1000000
+
+The loop version is far too slow to run at 10M rows, so it is timed on a
+small sample and its rows/s is used to estimate the full run.
+"""
+
+import argparse
+import sys
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from water_filter import generate_readings                  # noqa: E402
+from water_filter.generator import READINGS_PER_FILTER       # noqa: E402
+
+
+def generate_readings_loop(num_filters, readings_per_filter):
+    """The per-reading loop from 01_generate_water_filter_data.ipynb."""
+    regions = np.random.choice(['North', 'South', 'East', 'West'], num_filters,
+                               p=[0.3, 0.25, 0.25, 0.2])
+    region_tds = {'North': 350, 'South': 500, 'East': 650, 'West': 250}
+    records = []
+    for i in range(num_filters):
+        region = regions[i]
+        base_tds_input = region_tds[region]
+        initial_age = np.random.randint(0, 200)
+        for j in range(readings_per_filter):
+            filter_age_days = max(0, initial_age + j * 7 + np.random.randint(-2, 3))
+            reading_date = datetime(2025, 1, 1) + timedelta(days=j * 7 + np.random.randint(-1, 2))
+            month = reading_date.month
+            seasonal_temp = 20 + 10 * np.sin((month - 3) * np.pi / 6)
+            temperature_c = np.clip(seasonal_temp + np.random.randn() * 3, 10, 40)
+            seasonal_factor = 1.0 + 0.15 * np.sin((month - 6) * np.pi / 6)
+            tds_input = np.clip(base_tds_input * seasonal_factor + np.random.randn() * 50, 100, 900)
+            pressure_psi = np.clip(45 + np.random.randn() * 10, 25, 75)
+            daily_usage = np.random.uniform(8, 40)
+            total_usage = daily_usage * filter_age_days
+            age_factor = filter_age_days / 365
+            tds_output = 25 + age_factor ** 1.5 * 80 + np.random.randn() * 8
+            tds_output += (tds_input - 400) * 0.03
+            tds_output = np.clip(tds_output, 10, tds_input * 0.8)
+            flow_rate = 2.2 - age_factor * 1.2 + np.random.randn() * 0.15
+            flow_rate = np.clip(flow_rate + (pressure_psi - 45) * 0.01, 0.2, 2.8)
+            sediment_filter_age = np.clip(filter_age_days % 120 + np.random.randint(-5, 5), 0, 150)
+            if filter_age_days < 150:
+                membrane_status = 'good'
+            elif filter_age_days < 280:
+                membrane_status = np.random.choice(['good', 'degraded'], p=[0.6, 0.4])
+            else:
+                membrane_status = np.random.choice(['degraded', 'needs_replacement'], p=[0.4, 0.6])
+            maintenance_score = 0
+            if tds_output > 80: maintenance_score += 2
+            if tds_output > 120: maintenance_score += 2
+            if flow_rate < 1.0: maintenance_score += 2
+            if flow_rate < 0.7: maintenance_score += 1
+            if filter_age_days > 300: maintenance_score += 1
+            if membrane_status == 'needs_replacement': maintenance_score += 3
+            if membrane_status == 'degraded': maintenance_score += 1
+            if sediment_filter_age > 100: maintenance_score += 1
+            maintenance_score += np.random.randn() * 0.5
+            records.append({
+                'filter_id': f'WF{str(i+1).zfill(4)}',
+                'region': region,
+                'reading_date': reading_date.strftime('%Y-%m-%d'),
+                'filter_age_days': int(filter_age_days),
+                'tds_input': round(tds_input, 1),
+                'tds_output': round(tds_output, 1),
+                'flow_rate_lpm': round(flow_rate, 2),
+                'pressure_psi': round(pressure_psi, 1),
+                'temperature_c': round(temperature_c, 1),
+                'daily_usage_liters': round(daily_usage, 1),
+                'total_usage_liters': round(total_usage, 0),
+                'sediment_filter_age_days': int(sediment_filter_age),
+                'membrane_status': membrane_status,
+                'maintenance_needed': 1 if maintenance_score >= 3 else 0,
+                'tds_alert': 1 if tds_output > 100 else 0,
+            })
+    return pd.DataFrame(records)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--rows', type=int, default=10_000_000)
+    parser.add_argument('--loop-rows', type=int, default=20_000,
+                        help='sample size used to time the loop version')
+    args = parser.parse_args()
+
+    num_filters = args.rows // READINGS_PER_FILTER
+    loop_filters = args.loop_rows // READINGS_PER_FILTER
+
+    np.random.seed(42)
+    start = time.perf_counter()
+    loop_df = generate_readings_loop(loop_filters, READINGS_PER_FILTER)
+    loop_rate = len(loop_df) / (time.perf_counter() - start)
+
+    start = time.perf_counter()
+    df = generate_readings(num_filters, READINGS_PER_FILTER, seed=42)
+    vec_seconds = time.perf_counter() - start
+    vec_rate = len(df) / vec_seconds
+
+    print(f"Loop:       {loop_rate:>12,.0f} rows/s  "
+          f"(est. {len(df) / loop_rate:,.0f} s for {len(df):,} rows)")
+    print(f"Vectorized: {vec_rate:>12,.0f} rows/s  "
+          f"({vec_seconds:.2f} s for {len(df):,} rows)")
+    print(f"Speedup:    {vec_rate / loop_rate:,.0f}x")
+
+    # Same distributions: compare summary stats of the two generators
+    numeric = loop_df.select_dtypes(include=[np.number]).columns
+    summary = pd.DataFrame({
+        'loop_mean': loop_df[numeric].mean(),
+        'vectorized_mean': df[numeric].mean(),
+        'loop_std': loop_df[numeric].std(),
+        'vectorized_std': df[numeric].std(),
+    })
+    print("\nDistribution check:")
+    print(summary.round(3).to_string())
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,76 @@
+"""
+Benchmark: sweeping n_estimators - GridSearchCV vs growing warm-started forests.
+
+Usage (from phase6_project/):
+    python benchmarks/bench_growth.py                     # Step 7's grid on 10k rows
+    python benchmarks/bench_growth.py --sizes 50 100 200 400 --rows 20000
+
+GridSearchCV fits every tree count from scratch; GrowingForestSearch
+(tuning.py, method='grow') grows one forest per remaining combination and
+fold through the tree counts. Prints wall time and fit seconds for both,
+the cost of fitting only the largest forest per combination and fold (the
+lower bound), and whether every candidate's CV score is identical.
+"""
+
+import argparse
+import sys
+import time
+import warnings
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+from sklearn.model_selection import train_test_split
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from water_filter import (add_engineered_features, encode_readings, generate_readings,  # noqa: E402
+                          split_features)
+from water_filter.generator import READINGS_PER_FILTER                     # noqa: E402
+from water_filter.tuning import PARAM_GRID, tune_random_forest            # noqa: E402
+
+
+def run(name, X_train, y_train, **options):
+    start = time.perf_counter()
+    search, log = tune_random_forest(X_train, y_train, **options)
+    seconds = time.perf_counter() - start
+    print(f"{name:<22} {seconds:8.1f} s wall   {log['fit_s'].sum():8.1f} s of fits   "
+          f"winner {search.best_params_}")
+    return search, seconds
+
+
+def by_params(search):
+    results = pd.DataFrame(search.cv_results_)
+    results.index = results['params'].apply(lambda p: repr(sorted(p.items())))
+    return results.sort_index()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--rows', type=int, default=10_000)
+    parser.add_argument('--sizes', type=int, nargs='+', default=PARAM_GRID['n_estimators'],
+                        help='n_estimators values to sweep')
+    args = parser.parse_args()
+    warnings.filterwarnings('ignore')
+
+    df = generate_readings(args.rows // READINGS_PER_FILTER, READINGS_PER_FILTER)
+    X, y = split_features(add_engineered_features(encode_readings(df)))
+    X_train, _, y_train, _ = train_test_split(X, y, test_size=0.2, random_state=42, stratify=y)
+    grid = {**PARAM_GRID, 'n_estimators': args.sizes}
+    print(f"{len(X_train):,} training rows, n_estimators {args.sizes}\n")
+
+    exhaustive, grid_s = run('GridSearchCV', X_train, y_train, method='grid', param_grid=grid)
+    grown, grow_s = run('GrowingForestSearch', X_train, y_train, method='grow', param_grid=grid)
+    _, largest_s = run('largest forest only', X_train, y_train, method='grid',
+                       param_grid={**grid, 'n_estimators': [max(args.sizes)]})
+
+    a, b = by_params(exhaustive), by_params(grown)
+    same = (a.index.equals(b.index) and np.array_equal(a['mean_test_score'], b['mean_test_score'])
+            and exhaustive.best_params_ == grown.best_params_)
+    print(f"\ngrowing: {grid_s / grow_s:.2f}x less wall time than the grid, "
+          f"{grow_s / largest_s:.2f}x the cost of the largest forest alone")
+    print(f"identical CV scores and winner: {same}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,94 @@
+"""
+Benchmark: last maintenance visit per reading - cross join vs merge_asof vs AsOfJoin.
+
+Usage (from phase6_project/):
+    python benchmarks/bench_joins.py                      # 2M readings, 4 visits per filter
+    python benchmarks/bench_joins.py --rows 20000000 --events 10 --skip-cross
+
+The cross join is the 05_joining_data approach taken literally: pd.merge on
+filter_id, keep visits on or before the reading, take the last one per
+reading. pd.merge_asof needs both sides sorted by date and returns the
+readings in date order, so its time includes sorting and restoring the
+original order. AsOfJoin runs over the readings in chunks. Peak memory is
+the largest amount allocated at once during each run (tracemalloc).
+"""
+
+import argparse
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from water_filter import generate_readings                                 # noqa: E402
+from water_filter.generator import READINGS_PER_FILTER, generate_maintenance_log  # noqa: E402
+from water_filter.joins import AsOfJoin                                    # noqa: E402
+
+
+def cross_join(readings, events):
+    pairs = readings[['filter_id', 'reading_date']].reset_index().merge(events, on='filter_id')
+    pairs = pairs[pairs['service_date'] <= pairs['reading_date']]
+    last = pairs.sort_values(['index', 'service_date']).groupby('index').tail(1).set_index('index')
+    return readings.join(last[['service_date', 'service_type', 'cost']])
+
+
+def merge_asof(readings, events):
+    left = readings.reset_index().sort_values('reading_date', kind='stable')
+    joined = pd.merge_asof(left, events.sort_values('service_date', kind='stable'),
+                           left_on='reading_date', right_on='service_date', by='filter_id')
+    return joined.set_index('index').sort_index()
+
+
+def asof_chunks(readings, events, chunksize):
+    """Join chunk by chunk, keeping only the columns compared (as a streaming job would write them out)."""
+    join = AsOfJoin(events)
+    chunks = [join.join(readings.iloc[start:start + chunksize])[['service_date', 'cost']]
+              for start in range(0, len(readings), chunksize)]
+    return pd.concat(chunks), join.report()
+
+
+def measure(name, func):
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = func()
+    seconds = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"{name:<12} {seconds:8.2f} s   peak {peak / 1024 ** 2:>9,.1f} MB")
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--rows', type=int, default=2_000_000)
+    parser.add_argument('--events', type=int, default=4, help='maintenance visits per filter')
+    parser.add_argument('--chunksize', type=int, default=1_000_000)
+    parser.add_argument('--skip-cross', action='store_true', help='leave out the cross join')
+    args = parser.parse_args()
+
+    filters = args.rows // READINGS_PER_FILTER
+    readings = generate_readings(filters, READINGS_PER_FILTER, seed=1)
+    events = generate_maintenance_log(filters, args.events, seed=2)
+    print(f"{len(readings):,} readings, {len(events):,} maintenance visits, "
+          f"chunks of {args.chunksize:,}\n")
+
+    results = {}
+    if not args.skip_cross:
+        results['cross join'] = measure('cross join', lambda: cross_join(readings, events))
+    results['merge_asof'] = measure('merge_asof', lambda: merge_asof(readings, events))
+    joined, report = measure('AsOfJoin', lambda: asof_chunks(readings, events, args.chunksize))
+
+    print()
+    for name, expected in results.items():
+        same = all(np.array_equal(joined[col].to_numpy(), expected[col].to_numpy(), equal_nan=True)
+                   for col in ['service_date', 'cost'])
+        print(f"identical to {name}: {same}")
+    print(f"\nReport: {report}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,74 @@
+"""
+Benchmark: focused queries on the partitioned layout vs a full scan.
+
+Usage (from phase6_project/):
+    python benchmarks/bench_partitions.py --rows 5000000
+
+Query: mean tds_output for region == 'North' and month in (6, 7).
+"""
+
+import argparse
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from water_filter import (generate_readings, load_columnar, load_partitioned,     # noqa: E402
+                          load_readings_csv, save_columnar, write_partitioned)
+from water_filter.generator import READINGS_PER_FILTER                          # noqa: E402
+
+
+def timed(func, repeats):
+    best = float('inf')
+    for _ in range(repeats):
+        start = time.perf_counter()
+        result = func()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--rows', type=int, default=5_000_000)
+    parser.add_argument('--repeats', type=int, default=3)
+    args = parser.parse_args()
+
+    df = generate_readings(args.rows // READINGS_PER_FILTER, READINGS_PER_FILTER, seed=42)
+    with tempfile.TemporaryDirectory() as tmp:
+        csv_path = Path(tmp) / 'readings.csv'
+        col_path = Path(tmp) / 'readings.columnar'
+        part_path = Path(tmp) / 'readings.partitioned'
+        df.to_csv(csv_path, index=False)
+        save_columnar(df, col_path)
+        partitions = write_partitioned(df, part_path)
+        del df
+
+        def full_scan(load):
+            def query():
+                data = load()
+                mask = (data['region'] == 'North') & data['reading_date'].dt.month.isin([6, 7])
+                return data.loc[mask, 'tds_output'].mean()
+            return query
+
+        def pushdown():
+            data = load_partitioned(part_path, [('region', '==', 'North'), ('month', 'in', (6, 7))],
+                                    columns=['tds_output'])
+            return data['tds_output'].mean()
+
+        rows = [
+            ('CSV full scan', *timed(full_scan(lambda: load_readings_csv(csv_path)), args.repeats)),
+            ('columnar full scan', *timed(full_scan(lambda: load_columnar(col_path)), args.repeats)),
+            ('partition pushdown', *timed(pushdown, args.repeats)),
+        ]
+
+    table = pd.DataFrame(rows, columns=['method', 'seconds', 'mean_tds_output']).set_index('method')
+    print(f"Rows: {args.rows:,}  Partitions: {partitions}\n")
+    print(table.round(4).to_string())
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,83 @@
+"""
+Benchmark: CV split planning - per-call row folds vs one filter-grouped SplitPlan.
+
+Usage (from phase6_project/):
+    python benchmarks/bench_splits.py                     # 10k readings, the Step 6 models
+    python benchmarks/bench_splits.py --rows 2000000 --skip-models
+
+Times building shuffled row folds (like cv=5 on train_test_split's shuffled
+X_train) on every call against building a SplitPlan once and handing out
+its stored indices, and the memory of both; checks the plan's balance
+against sklearn's StratifiedGroupKFold. Then scores each Step 6 model with both kinds of folds:
+how many validation filters were also in training, and the CV recall.
+"""
+
+import argparse
+import sys
+import time
+import warnings
+from pathlib import Path
+
+from sklearn.model_selection import StratifiedGroupKFold, StratifiedKFold, cross_val_score
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from water_filter import (add_engineered_features, encode_readings, generate_readings,  # noqa: E402
+                          make_models, split_features)
+from water_filter.generator import READINGS_PER_FILTER                     # noqa: E402
+from water_filter.splits import SplitPlan, shared_groups                  # noqa: E402
+
+
+def timed(func):
+    start = time.perf_counter()
+    result = func()
+    return result, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--rows', type=int, default=10_000)
+    parser.add_argument('--calls', type=int, default=4, help='CV calls sharing the folds (models)')
+    parser.add_argument('--skip-models', action='store_true', help='only time the split planning')
+    args = parser.parse_args()
+    warnings.filterwarnings('ignore')
+
+    df = generate_readings(args.rows // READINGS_PER_FILTER, READINGS_PER_FILTER)
+    X, y = split_features(add_engineered_features(encode_readings(df)))
+    groups = df['filter_id']
+    print(f"{len(X):,} readings from {groups.nunique():,} filters\n")
+
+    row_folds = StratifiedKFold(5, shuffle=True, random_state=42)
+    folds, row_s = timed(lambda: [list(row_folds.split(X, y)) for _ in range(args.calls)])
+    plan, build_s = timed(lambda: SplitPlan.build(groups, y))
+    _, reuse_s = timed(lambda: [list(plan.split(X, y)) for _ in range(args.calls)])
+    row_mb = sum(a.nbytes for train, test in folds[0] for a in (train, test)) / 1024 ** 2
+    plan_mb = (plan.fold_of.nbytes + sum(a.nbytes for pair in plan._folds for a in pair)) / 1024 ** 2
+    print(f"row folds, {args.calls} calls       {row_s:8.3f} s   {row_mb:8.1f} MB per call")
+    print(f"SplitPlan.build (once)      {build_s:8.3f} s   {plan_mb:8.1f} MB "
+          f"({plan.fold_of.nbytes / 1024 ** 2:.1f} MB to save)")
+    print(f"SplitPlan, {args.calls} calls       {reuse_s:8.3f} s")
+
+    sklearn_folds = StratifiedGroupKFold(5, shuffle=True, random_state=42)
+    _, sklearn_s = timed(lambda: list(sklearn_folds.split(X, y, groups)))
+    print(f"StratifiedGroupKFold (once) {sklearn_s:8.3f} s\n")
+    for name, cv in [('SplitPlan', plan), ('StratifiedGroupKFold', sklearn_folds)]:
+        rates = [y.iloc[test].mean() for _, test in cv.split(X, y, groups)]
+        sizes = [len(test) for _, test in cv.split(X, y, groups)]
+        print(f"{name:<22} fold rows {min(sizes):,}-{max(sizes):,}   "
+              f"maintenance rate {min(rates):.4f}-{max(rates):.4f}")
+    if args.skip_models:
+        return
+
+    leaked = shared_groups(row_folds, groups, y)['groups_in_train'].sum()
+    print(f"\nvalidation filters also in training: row folds {leaked}, "
+          f"plan {shared_groups(plan, groups, y)['groups_in_train'].sum()}\n")
+    print(f"{'Model':<22} {'row folds':>16} {'filter folds':>16}")
+    for name, model in make_models().items():
+        by_row = cross_val_score(model, X, y, cv=row_folds, scoring='recall')
+        by_filter = cross_val_score(model, X, y, cv=plan, scoring='recall')
+        print(f"{name:<22} {by_row.mean():>8.4f} ± {by_row.std():.4f} {by_filter.mean():>8.4f} ± {by_filter.std():.4f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,85 @@
+"""
+Benchmark: load time and memory, CSV vs binary columnar format.
+
+Usage (from phase6_project/):
+    python benchmarks/bench_storage.py --rows 5000000
+
+Compares pd.read_csv (the 02 notebook's current path) with load_columnar(),
+both on a freshly generated dataset written to a temp directory.
+"""
+
+import argparse
+import gc
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from water_filter import generate_readings, load_columnar, save_columnar     # noqa: E402
+from water_filter.generator import READINGS_PER_FILTER                     # noqa: E402
+from water_filter.profiling import current_rss_mb                          # noqa: E402
+
+
+def dir_size_mb(path):
+    path = Path(path)
+    files = path.iterdir() if path.is_dir() else [path]
+    return sum(f.stat().st_size for f in files) / 1024 ** 2
+
+
+def measure(name, load, repeats):
+    """Best-of-N load time, RSS growth and DataFrame size for one loader."""
+    times = []
+    for _ in range(repeats):
+        gc.collect()
+        rss_before = current_rss_mb()
+        start = time.perf_counter()
+        df = load()
+        times.append(time.perf_counter() - start)
+        rss_after = current_rss_mb()
+        # Touch one column, like a real query would
+        df['tds_output'].mean()
+        rss_used = current_rss_mb()
+        frame_mb = df.memory_usage(deep=True).sum() / 1024 ** 2
+        del df
+    return {
+        'loader': name,
+        'load_s': round(min(times), 3),
+        'rss_after_load_mb': round(rss_after - rss_before, 1),
+        'rss_after_query_mb': round(rss_used - rss_before, 1),
+        'frame_mb': round(frame_mb, 1),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--rows', type=int, default=5_000_000)
+    parser.add_argument('--repeats', type=int, default=3)
+    args = parser.parse_args()
+
+    df = generate_readings(args.rows // READINGS_PER_FILTER, READINGS_PER_FILTER, seed=42)
+    with tempfile.TemporaryDirectory() as tmp:
+        csv_path = Path(tmp) / 'water_filter_readings.csv'
+        col_path = Path(tmp) / 'water_filter_readings.columnar'
+        df.to_csv(csv_path, index=False)
+        save_columnar(df, col_path)
+        del df
+
+        results = [
+            measure('pd.read_csv', lambda: pd.read_csv(csv_path), args.repeats),
+            measure('load_columnar', lambda: load_columnar(col_path), args.repeats),
+        ]
+        sizes = {'pd.read_csv': dir_size_mb(csv_path), 'load_columnar': dir_size_mb(col_path)}
+
+    table = pd.DataFrame(results).set_index('loader')
+    table['disk_mb'] = pd.Series(sizes).round(1)
+    print(f"Rows: {args.rows:,}\n")
+    print(table.to_string())
+    print(f"\nLoad speedup: {table.loc['pd.read_csv', 'load_s'] / table.loc['load_columnar', 'load_s']:,.0f}x")
+
+
+if __name__ == '__main__':
+    main()
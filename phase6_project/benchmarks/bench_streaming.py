@@ -0,0 +1,55 @@
+"""
+Benchmark: streaming CSV generation with bounded memory.
+
+Usage (from phase6_project/):
+    python benchmarks/bench_streaming.py --rows 10000000 --chunk-filters 10000
+    python benchmarks/bench_streaming.py --rows 10000000 --workers 8
+
+Run it with different --rows values: peak RSS should stay flat as the fleet
+grows (one shard of SHARD_FILTERS filters per worker, plus the chunk being
+written). The output file is the same for every --workers and
+--chunk-filters value.
+"""
+
+import argparse
+import hashlib
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from water_filter import write_readings_csv                              # noqa: E402
+from water_filter.generator import CHUNK_FILTERS, READINGS_PER_FILTER    # noqa: E402
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--rows', type=int, default=10_000_000)
+    parser.add_argument('--chunk-filters', type=int, default=CHUNK_FILTERS)
+    parser.add_argument('--workers', type=int, default=os.cpu_count())
+    parser.add_argument('--output', help='CSV path (default: a temp file, deleted afterwards)')
+    args = parser.parse_args()
+
+    num_filters = args.rows // READINGS_PER_FILTER
+    with tempfile.TemporaryDirectory() as tmp:
+        path = args.output or Path(tmp) / 'water_filter_readings.csv'
+        report = write_readings_csv(path, num_filters, READINGS_PER_FILTER,
+                                    chunk_filters=args.chunk_filters, workers=args.workers,
+                                    verbose=False)
+        with open(path, 'rb') as f:
+            digest = hashlib.file_digest(f, 'sha256').hexdigest()
+
+    print(f"Rows:       {report['rows']:,}")
+    print(f"Chunk size: {args.chunk_filters:,} filters "
+          f"({args.chunk_filters * READINGS_PER_FILTER:,} rows)")
+    print(f"Time:       {report['seconds']:.1f} s ({report['rows_per_s']:,} rows/s)")
+    print(f"Workers:    {args.workers}")
+    print(f"Peak RSS:   {report['peak_rss_mb']:,} MB"
+          + (f" (workers: {report['peak_rss_worker_mb']:,} MB)" if 'peak_rss_worker_mb' in report else ''))
+    print(f"SHA-256:    {digest}")
+
+
+if __name__ == '__main__':
+    main()
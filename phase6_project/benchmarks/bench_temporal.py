@@ -0,0 +1,84 @@
+"""
+Benchmark: per-filter trend features, groupby/rolling vs vectorized vs incremental.
+
+Usage (from phase6_project/):
+    python benchmarks/bench_temporal.py                  # 1M rows
+    python benchmarks/bench_temporal.py --rows 5000000
+
+The pandas version is the "recompute everything every day" approach. The
+incremental column is the cost of one day's new readings (one per filter)
+through TemporalFeatures.update() once the state is initialized.
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from water_filter import generate_readings                                 # noqa: E402
+from water_filter.generator import READINGS_PER_FILTER                     # noqa: E402
+from water_filter.temporal import (TEMPORAL_FEATURES, WINDOW, TemporalFeatures,  # noqa: E402
+                                   compute_temporal_features)
+
+
+def pandas_features(df, window):
+    """tds_slope and flow_delta with sort + groupby/rolling (the slow baseline)."""
+    df = df.sort_values(['filter_id', 'reading_date'])
+    days = (df['reading_date'] - pd.Timestamp('1970-01-01')).dt.days.astype(float)
+    groups = df.groupby('filter_id', observed=True)
+    flow_delta = groups['flow_rate_lpm'].diff()
+    # slope = cov(days, tds) / var(days) over the window
+    frame = pd.DataFrame({'filter_id': df['filter_id'], 'days': days, 'tds': df['tds_output']})
+    rolling = frame.groupby('filter_id', observed=True)[['days', 'tds']].rolling(window)
+    cov = rolling.cov().xs('tds', level=-1)['days']
+    var = rolling.var()['days']
+    return pd.DataFrame({'tds_slope': (cov / var).to_numpy(), 'flow_delta': flow_delta.to_numpy()})
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--rows', type=int, default=1_000_000)
+    parser.add_argument('--window', type=int, default=WINDOW)
+    args = parser.parse_args()
+
+    num_filters = args.rows // READINGS_PER_FILTER
+    df = generate_readings(num_filters, READINGS_PER_FILTER)
+    last_day = df.groupby('filter_id', observed=True).cumcount() == READINGS_PER_FILTER - 1
+    history, today = df[~last_day], df[last_day]
+
+    start = time.perf_counter()
+    pandas_features(df, args.window)
+    pandas_s = time.perf_counter() - start
+
+    start = time.perf_counter()
+    features = compute_temporal_features(df, args.window)
+    vectorized_s = time.perf_counter() - start
+
+    state = TemporalFeatures(args.window)
+    start = time.perf_counter()
+    state.initialize(history)
+    init_s = time.perf_counter() - start
+
+    readings = today.to_dict('records')
+    start = time.perf_counter()
+    updates = [state.update(r) for r in readings]
+    update_s = time.perf_counter() - start
+
+    same = np.array_equal(pd.DataFrame(updates, columns=TEMPORAL_FEATURES).to_numpy(),
+                          features.loc[today.index].to_numpy(), equal_nan=True)
+    print(f"{len(df):,} rows, {num_filters:,} filters, window {args.window}\n")
+    print(f"groupby/rolling recompute:  {pandas_s:8.2f} s")
+    print(f"vectorized recompute:       {vectorized_s:8.2f} s  ({pandas_s / vectorized_s:.0f}x)")
+    print(f"initialize from history:    {init_s:8.2f} s")
+    print(f"one day of new readings:    {update_s:8.2f} s  "
+          f"({len(readings):,} updates, {update_s / len(readings) * 1e6:.0f} us each)")
+    print(f"\nIncremental == full recompute: {same}")
+
+
+if __name__ == '__main__':
+    main()
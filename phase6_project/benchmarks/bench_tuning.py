@@ -0,0 +1,75 @@
+"""
+Benchmark: Step 7 RandomForest search - GridSearchCV vs successive halving.
+
+Usage (from phase6_project/):
+    python benchmarks/bench_tuning.py                     # the notebook's 10k-row dataset
+    python benchmarks/bench_tuning.py --rows 50000 --resource n_estimators
+
+Runs the exhaustive grid once, then the halving search, and prints for each:
+wall time, total fit seconds, the per-round budget log, the winner, where
+the halving winner ranks in the full grid, and both winners' recall on the
+held-out test set.
+"""
+
+import argparse
+import sys
+import time
+import warnings
+from pathlib import Path
+
+import pandas as pd
+from sklearn.metrics import recall_score
+from sklearn.model_selection import train_test_split
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from water_filter import (add_engineered_features, encode_readings, generate_readings,  # noqa: E402
+                          split_features)
+from water_filter.generator import READINGS_PER_FILTER                     # noqa: E402
+from water_filter.tuning import tune_random_forest                        # noqa: E402
+
+
+def run(name, X_train, y_train, X_test, y_test, **options):
+    start = time.perf_counter()
+    search, log = tune_random_forest(X_train, y_train, **options)
+    seconds = time.perf_counter() - start
+    test_recall = recall_score(y_test, search.best_estimator_.predict(X_test))
+    print(f"--- {name}: {seconds:.1f} s wall, {log['fit_s'].sum():.1f} s of fits, "
+          f"{log['fits'].sum()} fits")
+    print(log.drop(columns='best_params').to_string())
+    print(f"winner: {search.best_params_}  CV recall {search.best_score_:.4f}  "
+          f"test recall {test_recall:.4f}\n")
+    return search, seconds
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--rows', type=int, default=10_000)
+    parser.add_argument('--resource', default='n_samples', help="'n_samples' or 'n_estimators'")
+    args = parser.parse_args()
+    warnings.filterwarnings('ignore')
+
+    df = generate_readings(args.rows // READINGS_PER_FILTER, READINGS_PER_FILTER)
+    X, y = split_features(add_engineered_features(encode_readings(df)))
+    X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=0.2, random_state=42, stratify=y)
+    print(f"{len(X_train):,} training rows\n")
+
+    grid, grid_s = run('GridSearchCV', X_train, y_train, X_test, y_test, method='grid')
+    halving, halving_s = run(f'successive halving ({args.resource})', X_train, y_train, X_test, y_test,
+                             method='halving', resource=args.resource)
+
+    results = pd.DataFrame(grid.cv_results_)
+    # With resource='n_estimators' the forest size isn't a grid choice: match the other parameters
+    winner = {k: v for k, v in halving.best_params_.items() if k != args.resource}
+    matches = results['params'].apply(lambda p: all(p.get(k) == v for k, v in winner.items()))
+    ranks = results.loc[matches, 'rank_test_score']
+    scores = results['mean_test_score']
+    print(f"halving: {grid_s / halving_s:.1f}x less wall time")
+    print(f"same winner as the grid: {halving.best_params_ == grid.best_params_}; "
+          f"halving winner's rank in the grid: {ranks.min()} of {len(results)}")
+    print(f"grid CV recall spread over all candidates: {scores.min():.4f} - {scores.max():.4f} "
+          f"(mean fold std {results['std_test_score'].mean():.4f})")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,270 @@
+"""
+Benchmark suite: time every stage of the water filter pipeline.
+
+Usage (from phase6_project/):
+    python benchmarks/run_benchmarks.py                              # print results
+    python benchmarks/run_benchmarks.py --output results.json        # save as JSON
+    python benchmarks/run_benchmarks.py --save-baseline              # store a baseline
+    python benchmarks/run_benchmarks.py --baseline benchmarks/baseline.json
+
+Each stage runs `--warmup` untimed rounds, then `--repeats` timed rounds,
+then one more round under tracemalloc to record its peak memory. With
+--baseline, stages whose median time grew by more than --threshold are
+reported as regressions and the exit code is 1 - so CI catches slowdowns.
+
+Stages: generate, load_csv, load_columnar, preprocess, features, transform,
+fit/<model> for each Step 6 model, predict_proba, check_filter_health,
+score_reading, score_readings.
+"""
+
+import argparse
+import json
+import platform
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime, timezone
+from functools import cached_property
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import sklearn
+from sklearn.model_selection import train_test_split
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from water_filter import (ReadingPreprocessor, generate_readings, load_columnar,  # noqa: E402
+                          save_columnar)
+from water_filter.generator import READINGS_PER_FILTER                         # noqa: E402
+from water_filter.pipeline import (add_engineered_features, check_filter_health,  # noqa: E402
+                                   encode_readings, make_models, score_reading,
+                                   score_readings, split_features)
+
+DEFAULT_BASELINE = Path(__file__).resolve().parent / 'baseline.json'
+HEALTH_CHECKS = 200          # Single-reading calls per check_filter_health round
+
+
+# -----------------------------------------------------------------------------
+# MEASUREMENT
+# -----------------------------------------------------------------------------
+def measure(func, repeats, warmup):
+    """Time func() `repeats` times after `warmup` runs, then record its peak memory."""
+    for _ in range(warmup):
+        func()
+
+    times = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        func()
+        times.append(time.perf_counter() - start)
+
+    tracemalloc.start()
+    func()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {
+        'min_s': round(min(times), 6),
+        'median_s': round(statistics.median(times), 6),
+        'mean_s': round(statistics.fmean(times), 6),
+        'stdev_s': round(statistics.stdev(times), 6) if len(times) > 1 else 0.0,
+        'repeats': repeats,
+        'peak_mb': round(peak / 1024 ** 2, 2),
+    }
+
+
+# -----------------------------------------------------------------------------
+# STAGES
+# -----------------------------------------------------------------------------
+class PipelineInputs:
+    """
+    The inputs each stage needs, built on first use and then shared.
+
+    Asking for the test split fits nothing; asking for the model builds the
+    data, the features and the split first - but only once.
+    """
+
+    def __init__(self, rows, workdir):
+        self.num_filters = max(1, rows // READINGS_PER_FILTER)
+        self.workdir = Path(workdir)
+
+    @cached_property
+    def generated(self):
+        return generate_readings(self.num_filters, READINGS_PER_FILTER, seed=42)
+
+    @cached_property
+    def csv_path(self):
+        path = self.workdir / 'water_filter_readings.csv'
+        self.generated.to_csv(path, index=False)
+        return path
+
+    @cached_property
+    def columnar_path(self):
+        path = self.workdir / 'water_filter_readings.columnar'
+        save_columnar(self.generated, path)
+        return path
+
+    @cached_property
+    def df(self):
+        return pd.read_csv(self.csv_path)
+
+    @cached_property
+    def encoded(self):
+        return encode_readings(self.df)
+
+    @cached_property
+    def preprocessor(self):
+        return ReadingPreprocessor().fit(self.df)
+
+    @cached_property
+    def split(self):
+        """(X, X_train, X_test, y_train, y_test)"""
+        X, y = split_features(add_engineered_features(self.encoded.copy()))
+        return (X, *train_test_split(X, y, test_size=0.2, random_state=42, stratify=y))
+
+    @cached_property
+    def model(self):
+        _, X_train, _, y_train, _ = self.split
+        return make_models()['Random Forest'].fit(X_train, y_train)
+
+
+def build_stages(rows, workdir, only=None):
+    """
+    Yield (name, func) for every pipeline stage (or those starting with a prefix in `only`).
+
+    Each stage gets its inputs from the previous stages' outputs, computed
+    once and before the stage is timed, so a stage's timing only covers its
+    own work. Inputs no requested stage needs are never built.
+    """
+    inputs = PipelineInputs(rows, workdir)
+
+    def wanted(name):
+        return not only or any(name.startswith(prefix) for prefix in only)
+
+    if wanted('generate'):
+        num_filters = inputs.num_filters
+        yield 'generate', lambda: generate_readings(num_filters, READINGS_PER_FILTER, seed=42)
+    if wanted('load_csv'):
+        csv_path = inputs.csv_path
+        yield 'load_csv', lambda: pd.read_csv(csv_path)
+    if wanted('load_columnar'):
+        columnar_path = inputs.columnar_path
+        yield 'load_columnar', lambda: load_columnar(columnar_path)
+
+    if wanted('preprocess'):
+        df = inputs.df
+        yield 'preprocess', lambda: encode_readings(df)
+    if wanted('features'):
+        encoded = inputs.encoded
+        yield 'features', lambda: add_engineered_features(encoded.copy())
+    if wanted('transform'):
+        df, preprocessor = inputs.df, inputs.preprocessor
+        yield 'transform', lambda: preprocessor.transform(df)
+
+    for name, model in make_models().items():
+        if wanted(f'fit/{name}'):
+            _, X_train, _, y_train, _ = inputs.split
+            yield f'fit/{name}', lambda model=model: model.fit(X_train, y_train)
+
+    if wanted('predict_proba'):
+        model, X_test = inputs.model, inputs.split[2]
+        yield 'predict_proba', lambda: model.predict_proba(X_test)
+    if wanted('check_filter_health'):
+        model = inputs.model
+        X, _, X_test, _, _ = inputs.split
+        readings = X_test.head(HEALTH_CHECKS).to_dict('records')
+        yield 'check_filter_health', lambda: [check_filter_health(r, model, X.columns) for r in readings]
+    if wanted('score_reading'):
+        model, preprocessor, X_test = inputs.model, inputs.preprocessor, inputs.split[2]
+        raw_readings = inputs.df.loc[X_test.index[:HEALTH_CHECKS]].to_dict('records')
+        yield 'score_reading', lambda: [score_reading(r, model, preprocessor) for r in raw_readings]
+    if wanted('score_readings'):
+        model, preprocessor = inputs.model, inputs.preprocessor
+        test_rows = inputs.df.loc[inputs.split[2].index]
+        yield 'score_readings', lambda: score_readings(test_rows, model, preprocessor)
+
+
+def run(rows, repeats, warmup, only=None):
+    stages = {}
+    with tempfile.TemporaryDirectory() as workdir:
+        for name, func in build_stages(rows, workdir, only):
+            print(f"  {name} ...", end='', flush=True)
+            stages[name] = measure(func, repeats, warmup)
+            print(f" {stages[name]['median_s']:.4f} s")
+    return {
+        'meta': {
+            'timestamp': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+            'rows': rows,
+            'repeats': repeats,
+            'warmup': warmup,
+            'python': platform.python_version(),
+            'numpy': np.__version__,
+            'pandas': pd.__version__,
+            'sklearn': sklearn.__version__,
+            'machine': platform.machine(),
+        },
+        'stages': stages,
+    }
+
+
+# -----------------------------------------------------------------------------
+# BASELINE COMPARISON
+# -----------------------------------------------------------------------------
+def compare(results, baseline, threshold):
+    """Table of current vs baseline median time; also returns the regressed stages."""
+    rows = []
+    for name, stage in results['stages'].items():
+        base = baseline['stages'].get(name)
+        if base is None:
+            rows.append((name, None, stage['median_s'], None, 'new'))
+            continue
+        ratio = stage['median_s'] / base['median_s'] if base['median_s'] else float('inf')
+        status = 'SLOWER' if ratio > 1 + threshold else ('faster' if ratio < 1 - threshold else 'ok')
+        rows.append((name, base['median_s'], stage['median_s'], round(ratio, 2), status))
+    table = pd.DataFrame(rows, columns=['stage', 'baseline_s', 'current_s', 'ratio', 'status'])
+    return table, table.loc[table['status'] == 'SLOWER', 'stage'].tolist()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--rows', type=int, default=50_000)
+    parser.add_argument('--repeats', type=int, default=3)
+    parser.add_argument('--warmup', type=int, default=1)
+    parser.add_argument('--stages', nargs='*', help='only run stages starting with these names')
+    parser.add_argument('--output', help='write results JSON here')
+    parser.add_argument('--baseline', help='compare against this results JSON')
+    parser.add_argument('--save-baseline', action='store_true',
+                        help=f'store these results as the baseline ({DEFAULT_BASELINE.name})')
+    parser.add_argument('--threshold', type=float, default=0.2,
+                        help='allowed slowdown before a stage counts as a regression (0.2 = 20%%)')
+    args = parser.parse_args()
+
+    print(f"Benchmarking {args.rows:,} rows ({args.warmup} warmup + {args.repeats} repeats)")
+    results = run(args.rows, args.repeats, args.warmup, args.stages)
+
+    table = pd.DataFrame(results['stages']).T[['median_s', 'min_s', 'stdev_s', 'peak_mb']]
+    print(f"\n{table.to_string()}")
+
+    if args.output:
+        Path(args.output).write_text(json.dumps(results, indent=2))
+        print(f"\nResults written to {args.output}")
+    if args.save_baseline:
+        DEFAULT_BASELINE.write_text(json.dumps(results, indent=2))
+        print(f"\nBaseline stored in {DEFAULT_BASELINE}")
+
+    if args.baseline:
+        baseline = json.loads(Path(args.baseline).read_text())
+        if baseline['meta']['rows'] != results['meta']['rows']:
+            print(f"\nWarning: baseline was run with {baseline['meta']['rows']:,} rows")
+        table, regressions = compare(results, baseline, args.threshold)
+        print(f"\nvs baseline {args.baseline}:\n{table.to_string(index=False)}")
+        if regressions:
+            print(f"\nREGRESSION: {', '.join(regressions)} slower than baseline by > {args.threshold:.0%}")
+            sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
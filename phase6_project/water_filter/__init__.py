@@ -0,0 +1,92 @@
+"""
+Water filter predictive maintenance - reusable building blocks.
+
+The notebooks in phase6_project/ teach the workflow step by step. This package
+holds the fleet-scale versions of those steps so notebooks, scoring jobs and
+benchmarks all share one implementation.
+
+Laravel parallel: the notebooks are the controllers, this package is app/Services.
+"""
+
+from .cache import FeatureCache, FoldCache
+from .cleaning import CleaningPipeline
+from .comparison import compare_models
+from .cube import AggregateCube
+from .eda import EDASummary, summarize_columnar, summarize_csv, summarize_partitioned
+from .features import FeatureKernel
+from .generator import (COLUMNS, generate_maintenance_log, generate_readings, generate_shard,
+                        iter_reading_chunks, write_readings_csv)
+from .imputation import GroupImputer
+from .index import FilterIndex
+from .joins import AsOfJoin, asof_join
+from .pipeline import (add_engineered_features, check_filter_health, encode_readings,
+                       make_models, score_reading, score_readings, split_features)
+from .preprocessing import ReadingPreprocessor
+from .profiling import PeakRSS, Throughput, current_rss_mb, peak_rss_mb
+from .scaling import StreamingScaler
+from .schema import (SCHEMA, apply_schema, iter_readings_csv, load_readings_csv, memory_report,
+                     validate_readings)
+from .splits import SplitPlan, shared_groups, take_rows
+from .storage import (append_columnar, append_partitioned, concat_readings, iter_columnar,
+                      list_partitions, load_columnar, load_partitioned, open_columnar, save_columnar,
+                      write_partitioned)
+from .temporal import TemporalFeatures, compute_temporal_features
+from .tuning import tune_random_forest
+
+__all__ = [
+    'AggregateCube',
+    'AsOfJoin',
+    'CleaningPipeline',
+    'COLUMNS',
+    'EDASummary',
+    'FeatureCache',
+    'FeatureKernel',
+    'FilterIndex',
+    'FoldCache',
+    'SCHEMA',
+    'add_engineered_features',
+    'append_columnar',
+    'append_partitioned',
+    'apply_schema',
+    'asof_join',
+    'check_filter_health',
+    'compare_models',
+    'compute_temporal_features',
+    'concat_readings',
+    'current_rss_mb',
+    'encode_readings',
+    'generate_maintenance_log',
+    'generate_readings',
+    'generate_shard',
+    'GroupImputer',
+    'iter_columnar',
+    'iter_reading_chunks',
+    'iter_readings_csv',
+    'list_partitions',
+    'load_columnar',
+    'load_partitioned',
+    'load_readings_csv',
+    'make_models',
+    'memory_report',
+    'open_columnar',
+    'peak_rss_mb',
+    'PeakRSS',
+    'ReadingPreprocessor',
+    'save_columnar',
+    'score_reading',
+    'score_readings',
+    'shared_groups',
+    'split_features',
+    'SplitPlan',
+    'StreamingScaler',
+    'summarize_columnar',
+    'summarize_csv',
+    'summarize_partitioned',
+    'take_rows',
+    'TemporalFeatures',
+    'Throughput',
+    'tune_random_forest',
+    'validate_readings',
+    'write_partitioned',
+    'write_readings_csv',
+]
@@ -0,0 +1,438 @@
+"""
+On-disk caches: the final feature matrix X and target y, and CV fold scores.
+
+Every run of 02_water_filter_ml_project.ipynb loads the readings, encodes
+them and engineers features before a model sees a single row. When neither
+the data nor the feature code changed, that work gives the same X and y
+every time. FeatureCache keeps them on disk:
+
+    cache = FeatureCache('../data/feature_cache', max_mb=2048)
+
+    def build():
+        df_ml = add_engineered_features(encode_readings(load_columnar(path)))
+        return split_features(df_ml)
+
+    X, y = cache.load_or_build(path, build)     # first run: build() + save
+    X, y = cache.load_or_build(path, build)     # later runs: memory-mapped load
+
+The cache key is a fingerprint of
+
+    - the source data: size and modification time of the file (or of every
+      file in a directory like the .columnar dataset); content=True hashes
+      the bytes instead
+    - the feature code: the source of build() and of the water_filter modules
+      that encode and engineer features, plus any extra `definition` objects
+
+so editing the data, the build function or the package gives a new key and
+a fresh build - nothing has to be cleared by hand.
+
+Each entry is a directory with one .npy file per column (the same layout as
+storage.py's columnar format), so X loads as a DataFrame over memory-mapped
+arrays: nothing is parsed and nothing is copied. Entries are written to a
+temporary directory and renamed into place, so a concurrent run never sees
+half an entry. Once the cache grows past max_mb, the least recently used
+entries are deleted.
+
+FoldCache does the same one level further down, for tuning. Changing one
+value in param_grid and re-running a search refits every fold of every
+unchanged configuration too. FoldCache stores each fold's score under a key
+of model class + parameters + scoring + the fold's row indices + a
+fingerprint of X and y, so only the new cells are computed:
+
+    folds = FoldCache('../data/fold_cache', max_mb=64)
+    folds.cross_val_score(RandomForestClassifier(random_state=42), X, y, cv=5, scoring='recall')
+    tune_random_forest(X_train, y_train, method='grid', cache=folds)    # tuning.CachedGridSearch
+
+Every fold result is a small JSON file, written by the worker that computed
+it to a temporary name and renamed into place - parallel workers (or two
+notebooks) writing at once never leave a torn file, and two writers of the
+same key write the same score. Only deterministic estimators (a fixed
+random_state) should be cached: the stored score is reused as-is.
+
+Laravel parallel: Cache::remember($key, fn () => ...), with the key built
+from the data file and the code version.
+"""
+
+import hashlib
+import inspect
+import json
+import os
+import shutil
+import time
+import uuid
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import sklearn
+from joblib import Parallel, delayed
+from sklearn.base import clone
+from sklearn.metrics import check_scoring
+from sklearn.model_selection import check_cv
+
+from . import features, pipeline, preprocessing, schema, storage
+from .splits import take_rows
+
+
+DEFAULT_MAX_MB = 2048
+# Modules whose code decides what X and y contain
+DEFINITION_MODULES = (features, pipeline, preprocessing, schema, storage)
+META_FILE = 'meta.json'
+DEFAULT_FOLD_MAX_MB = 64
+# Parameters that change how fast a model fits, not what it learns
+IGNORED_PARAMS = ('n_jobs', 'verbose')
+
+
+# -----------------------------------------------------------------------------
+# FINGERPRINTS
+# -----------------------------------------------------------------------------
+def fingerprint_data(path, content=False):
+    """
+    Hex digest identifying a data file or dataset directory.
+
+    By default from each file's relative path, size and mtime (instant, like
+    make); content=True reads and hashes every byte instead.
+    """
+    path = Path(path)
+    files = sorted(p for p in path.rglob('*') if p.is_file()) if path.is_dir() else [path]
+    digest = hashlib.blake2b(digest_size=16)
+    for file in files:
+        digest.update(str(file.relative_to(path) if path.is_dir() else file.name).encode())
+        if content:
+            with open(file, 'rb') as f:
+                for block in iter(lambda: f.read(1 << 20), b''):
+                    digest.update(block)
+        else:
+            stat = file.stat()
+            digest.update(f'{stat.st_size}:{stat.st_mtime_ns}'.encode())
+    return digest.hexdigest()
+
+
+def fingerprint_code(*objects):
+    """Hex digest of the source of functions, classes and modules (repr() for anything else)."""
+    digest = hashlib.blake2b(digest_size=16)
+    for obj in objects:
+        try:
+            text = inspect.getsource(obj)
+        except (OSError, TypeError):
+            # Not Python source (a dict of parameters, a lambda typed in a shell, ...)
+            code = getattr(obj, '__code__', None)
+            text = repr((code.co_code, code.co_consts)) if code is not None else repr(obj)
+        digest.update(text.encode())
+    return digest.hexdigest()
+
+
+def fingerprint_frame(*frames):
+    """Hex digest of in-memory data (DataFrames, Series, arrays): columns, dtypes and every value."""
+    digest = hashlib.blake2b(digest_size=16)
+    for frame in frames:
+        frame = frame if isinstance(frame, (pd.DataFrame, pd.Series)) else pd.DataFrame(np.asarray(frame))
+        columns = frame.columns if isinstance(frame, pd.DataFrame) else [frame.name]
+        dtypes = frame.dtypes if isinstance(frame, pd.DataFrame) else [frame.dtype]
+        digest.update(repr((list(columns), [str(d) for d in dtypes], frame.shape)).encode())
+        digest.update(pd.util.hash_pandas_object(frame, index=False).to_numpy().tobytes())
+    return digest.hexdigest()
+
+
+# -----------------------------------------------------------------------------
+# THE CACHE
+# -----------------------------------------------------------------------------
+class FeatureCache:
+    """
+    Directory of cached (X, y) pairs, keyed by data + code fingerprint.
+
+    max_mb bounds the total size of the entries (least recently used are
+    evicted first). content=True fingerprints data files by their bytes.
+    """
+
+    def __init__(self, root, max_mb=DEFAULT_MAX_MB, content=False):
+        self.root = Path(root)
+        self.root.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = int(max_mb * 1024 ** 2)
+        self.content = content
+        self.hits = 0
+        self.misses = 0
+        self.seconds = {'fingerprint': 0.0, 'load': 0.0, 'build': 0.0, 'save': 0.0}
+
+    def key(self, source, build=None, definition=()):
+        start = time.perf_counter()
+        objects = list(DEFINITION_MODULES) + ([build] if build is not None else []) + list(definition)
+        key = hashlib.blake2b(
+            (fingerprint_data(source, self.content) + fingerprint_code(*objects)).encode(),
+            digest_size=12).hexdigest()
+        self.seconds['fingerprint'] += time.perf_counter() - start
+        return key
+
+    def load_or_build(self, source, build, definition=()):
+        """
+        (X, y) for the data at `source`: loaded if cached, else build() and saved.
+
+        build() takes no arguments and returns (X DataFrame, y Series).
+        `definition` lists extra objects the result depends on (parameters,
+        helper functions) - they become part of the key.
+        """
+        key = self.key(source, build, definition)
+        cached = self.load(key)
+        if cached is not None:
+            return cached
+
+        start = time.perf_counter()
+        X, y = build()
+        self.seconds['build'] += time.perf_counter() - start
+        self.save(key, X, y, source=source)
+        return X, y
+
+    # -------------------------------------------------------------------------
+    # ENTRIES
+    # -------------------------------------------------------------------------
+    def load(self, key):
+        """Memory-mapped (X, y) of an entry, or None if it isn't cached."""
+        entry = self.root / key
+        if not (entry / META_FILE).exists():
+            self.misses += 1
+            return None
+        start = time.perf_counter()
+        with open(entry / META_FILE) as f:
+            meta = json.load(f)
+        X = pd.DataFrame({col: np.load(entry / f'x_{i:03d}.npy', mmap_mode='r')
+                          for i, col in enumerate(meta['columns'])}, copy=False)
+        y = pd.Series(np.load(entry / 'y.npy', mmap_mode='r'), name=meta['target'], copy=False)
+        os.utime(entry / META_FILE)          # Mark as recently used
+        self.hits += 1
+        self.seconds['load'] += time.perf_counter() - start
+        return X, y
+
+    def save(self, key, X, y, source=None):
+        """Write an entry atomically, then evict old entries if over max_mb."""
+        start = time.perf_counter()
+        entry = self.root / key
+        tmp = self.root / f'.tmp-{key}-{uuid.uuid4().hex[:8]}'
+        tmp.mkdir()
+        try:
+            for i, col in enumerate(X.columns):
+                np.save(tmp / f'x_{i:03d}.npy', X[col].to_numpy())
+            np.save(tmp / 'y.npy', np.asarray(y))
+            meta = {'columns': [str(col) for col in X.columns], 'target': y.name,
+                    'rows': len(X), 'source': str(source), 'created': time.time()}
+            with open(tmp / META_FILE, 'w') as f:
+                json.dump(meta, f)
+            os.replace(tmp, entry)
+        except OSError:
+            # Another process saved the same key first - theirs is identical
+            if not (entry / META_FILE).exists():
+                raise
+        finally:
+            shutil.rmtree(tmp, ignore_errors=True)
+        self.seconds['save'] += time.perf_counter() - start
+        self.evict(keep=key)
+
+    def entries(self):
+        """Cached entries, least recently used first: key, bytes, last_used, rows, source."""
+        found = []
+        for entry in self.root.iterdir():
+            meta_path = entry / META_FILE
+            if entry.name.startswith('.') or not meta_path.exists():
+                continue
+            with open(meta_path) as f:
+                meta = json.load(f)
+            found.append({
+                'key': entry.name,
+                'bytes': sum(p.stat().st_size for p in entry.iterdir()),
+                'last_used': meta_path.stat().st_mtime,
+                'rows': meta['rows'],
+                'source': meta['source'],
+            })
+        return sorted(found, key=lambda e: e['last_used'])
+
+    def evict(self, keep=None):
+        """Delete least recently used entries until the cache fits in max_mb. Returns the keys removed."""
+        entries = self.entries()
+        total = sum(e['bytes'] for e in entries)
+        removed = []
+        for entry in entries:
+            if total <= self.max_bytes:
+                break
+            if entry['key'] == keep:
+                continue
+            shutil.rmtree(self.root / entry['key'], ignore_errors=True)
+            total -= entry['bytes']
+            removed.append(entry['key'])
+        return removed
+
+    def clear(self):
+        for entry in self.entries():
+            shutil.rmtree(self.root / entry['key'], ignore_errors=True)
+
+    def report(self):
+        """Hits, misses, seconds per step and the cache's current size."""
+        entries = self.entries()
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            **{f'{step}_s': round(seconds, 3) for step, seconds in self.seconds.items()},
+            'entries': len(entries),
+            'size_mb': round(sum(e['bytes'] for e in entries) / 1024 ** 2, 1),
+        }
+
+
+# -----------------------------------------------------------------------------
+# CV FOLD RESULTS
+# -----------------------------------------------------------------------------
+def _fit_and_score(estimator, X, y, train, test, scorer, cache, key):
+    """Worker task: fit on one fold, score it, store the result. Returns the result."""
+    start = time.perf_counter()
+    estimator.fit(take_rows(X, train), take_rows(y, train))
+    fit_s = time.perf_counter() - start
+    start = time.perf_counter()
+    score = float(scorer(estimator, take_rows(X, test), take_rows(y, test)))
+    result = {'score': score, 'fit_s': fit_s, 'score_s': time.perf_counter() - start,
+              'estimator': type(estimator).__name__, 'created': time.time()}
+    cache.put(key, result)
+    return result
+
+
+class FoldCache:
+    """
+    Directory of cross-validation fold scores, one JSON file per fold.
+
+    max_mb bounds the total size (least recently used are evicted first,
+    after each batch of folds).
+    """
+
+    def __init__(self, root, max_mb=DEFAULT_FOLD_MAX_MB):
+        self.root = Path(root)
+        self.root.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = int(max_mb * 1024 ** 2)
+        self.hits = 0
+        self.misses = 0
+        self.seconds = {'fingerprint': 0.0, 'fit': 0.0}
+
+    def key(self, estimator, scoring, data, train, test):
+        """Fold key from the model, scoring, a fingerprint_frame() of X and y, and the fold's rows."""
+        params = {name: value for name, value in estimator.get_params(deep=True).items()
+                  if name.rsplit('__', 1)[-1] not in IGNORED_PARAMS}
+        digest = hashlib.blake2b(digest_size=16)
+        digest.update(repr((type(estimator).__module__, type(estimator).__qualname__,
+                            sklearn.__version__, sorted(params.items(), key=lambda item: item[0]))).encode())
+        digest.update((scoring if isinstance(scoring, str) else fingerprint_code(scoring)).encode())
+        digest.update(data.encode())
+        for rows in (train, test):
+            digest.update(np.asarray(rows, dtype=np.int64).tobytes())
+            digest.update(b'|')
+        return digest.hexdigest()
+
+    def _path(self, key):
+        return self.root / key[:2] / f'{key}.json'
+
+    def get(self, key):
+        """Stored result of a fold, or None."""
+        path = self._path(key)
+        try:
+            with open(path) as f:
+                result = json.load(f)
+            os.utime(path)                   # Mark as recently used
+        except (OSError, ValueError):
+            # Not cached (or evicted by another process while we looked)
+            return None
+        return result
+
+    def put(self, key, result):
+        """Write a fold result atomically - safe from any number of processes at once."""
+        path = self._path(key)
+        path.parent.mkdir(exist_ok=True)
+        tmp = path.with_name(f'.tmp-{key}-{uuid.uuid4().hex[:8]}')
+        try:
+            with open(tmp, 'w') as f:
+                json.dump(result, f)
+            os.replace(tmp, path)
+        finally:
+            if tmp.exists():
+                tmp.unlink()
+
+    # -------------------------------------------------------------------------
+    # SCORING FOLDS
+    # -------------------------------------------------------------------------
+    def fold_scores(self, estimators, X, y, cv=5, scoring=None, n_jobs=None):
+        """
+        Scores of every estimator on every fold: fetched if stored, else computed in parallel.
+
+        Returns (scores, fit_s, score_s), each an (estimators x folds) array.
+        The times are this run's: 0 for folds that came from the cache.
+        """
+        start = time.perf_counter()
+        splits = list(check_cv(cv, y, classifier=True).split(X, y))
+        data = fingerprint_frame(X, y)
+        keys = [[self.key(estimator, scoring, data, train, test) for train, test in splits]
+                for estimator in estimators]
+        self.seconds['fingerprint'] += time.perf_counter() - start
+
+        shape = (len(estimators), len(splits))
+        scores, fit_s, score_s = np.empty(shape), np.zeros(shape), np.zeros(shape)
+        missing = []
+        for i, row in enumerate(keys):
+            for j, key in enumerate(row):
+                result = self.get(key)
+                if result is None:
+                    missing.append((i, j))
+                else:
+                    scores[i, j] = result['score']
+        self.hits += len(keys) * len(splits) - len(missing)
+        self.misses += len(missing)
+
+        if missing:
+            start = time.perf_counter()
+            scorers = [check_scoring(estimator, scoring=scoring) for estimator in estimators]
+            results = Parallel(n_jobs=n_jobs)(
+                delayed(_fit_and_score)(clone(estimators[i]), X, y, *splits[j], scorers[i], self, keys[i][j])
+                for i, j in missing)
+            for (i, j), result in zip(missing, results):
+                scores[i, j], fit_s[i, j], score_s[i, j] = result['score'], result['fit_s'], result['score_s']
+            self.seconds['fit'] += time.perf_counter() - start
+            self.evict()
+        return scores, fit_s, score_s
+
+    def cross_val_score(self, estimator, X, y, cv=5, scoring=None, n_jobs=None):
+        """sklearn's cross_val_score, reusing stored folds. Returns one score per fold."""
+        return self.fold_scores([estimator], X, y, cv=cv, scoring=scoring, n_jobs=n_jobs)[0][0]
+
+    # -------------------------------------------------------------------------
+    # SIZE
+    # -------------------------------------------------------------------------
+    def entries(self):
+        """Stored fold files, least recently used first: path, bytes, last_used."""
+        found = []
+        for path in self.root.glob('*/*.json'):
+            try:
+                stat = path.stat()
+            except OSError:
+                continue
+            found.append({'path': path, 'bytes': stat.st_size, 'last_used': stat.st_mtime})
+        return sorted(found, key=lambda e: e['last_used'])
+
+    def evict(self):
+        """Delete least recently used fold files until the cache fits in max_mb. Returns how many."""
+        entries = self.entries()
+        total = sum(e['bytes'] for e in entries)
+        removed = 0
+        for entry in entries:
+            if total <= self.max_bytes:
+                break
+            entry['path'].unlink(missing_ok=True)
+            total -= entry['bytes']
+            removed += 1
+        return removed
+
+    def clear(self):
+        for entry in self.entries():
+            entry['path'].unlink(missing_ok=True)
+
+    def report(self):
+        """Hits, misses, seconds fingerprinting and fitting, and the cache's current size."""
+        entries = self.entries()
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            **{f'{step}_s': round(seconds, 3) for step, seconds in self.seconds.items()},
+            'folds': len(entries),
+            'size_mb': round(sum(e['bytes'] for e in entries) / 1024 ** 2, 2),
+        }
@@ -0,0 +1,187 @@
+"""
+Cleaning pipeline for messy vendor exports.
+
+phase3_pandas/07_data_cleaning.ipynb is the recipe: normalize column names,
+.str.strip().str.title() the string columns, pd.to_numeric, drop duplicate
+filter IDs and derive tds_category with .apply(lambda ...). On a million-row
+export every one of those string operations runs once per row, and .apply
+calls a Python lambda per row.
+
+CleaningPipeline does the same steps, but:
+
+- String columns are factorized first, so strip/case normalization runs once
+  per distinct raw value ('  North ', 'NORTH', 'north' ...) and rows just
+  pick up the cleaned value by code. For low-cardinality columns the raw ->
+  clean mapping is cached across chunks (a value seen in chunk 1 is never
+  normalized again) and the result is a categorical with stable codes.
+  ID-like columns, where almost every value is distinct, skip the cache and
+  stay object strings. Which of the two a column gets is decided once, on
+  the first chunk, so every chunk of the export has the same dtype.
+- tds_category is binned with pd.cut - one vectorized pass, no lambda.
+  A missing tds_output is 'Danger', as in the lesson's lambda (NaN < 80 and
+  NaN < 120 are both False).
+- Duplicates are dropped across the whole export, not just within a chunk:
+  duplicated() inside the chunk, then one isin() against a pd.Index of the
+  cleaned key values kept so far. All dropped rows are counted.
+- Exports are processed chunk by chunk, with a throughput report.
+
+    pipeline = CleaningPipeline()
+    for clean in pipeline.clean_csv('vendor_export.csv'):
+        ...
+    pipeline.report()        # rows in/out, duplicates, bad numbers, rows/s
+
+Laravel parallel: a FormRequest's prepareForValidation(), run over a
+LazyCollection of rows.
+"""
+
+import numpy as np
+import pandas as pd
+
+from .profiling import Throughput
+
+
+# Same rules as the lesson
+STRING_RULES = {'filter_id': 'upper', 'region': 'title', 'status': 'lower'}
+NUMERIC_COLUMNS = ['tds_output']
+DEDUPE_COLUMN = 'filter_id'
+TDS_BINS = [-np.inf, 80, 120, np.inf]          # < 80 Safe, < 120 Warning, else Danger
+TDS_LABELS = ['Safe', 'Warning', 'Danger']
+CHUNK_ROWS = 500_000
+HIGH_CARDINALITY = 0.2       # Distinct/rows in the first chunk above this: ID-like column, don't cache
+
+
+def normalize_column_names(columns):
+    """' Filter ID ' -> 'filter_id' (strip, lowercase, spaces to underscores)."""
+    return pd.Index(columns).str.strip().str.lower().str.replace(' ', '_')
+
+
+def tds_category(tds_output):
+    """Safe / Warning / Danger bins of tds_output as a categorical (NaN is 'Danger', like the lesson)."""
+    return pd.cut(tds_output, bins=TDS_BINS, labels=TDS_LABELS, right=False).fillna(TDS_LABELS[-1])
+
+
+class _StringNormalizer:
+    """
+    Raw -> clean strings for one column.
+
+    The first chunk decides the mode for the whole export: a cached mapping
+    returning categoricals with stable codes, or (ID-like columns) a plain
+    per-chunk clean returning object arrays.
+    """
+
+    def __init__(self, case):
+        if case not in ('upper', 'lower', 'title', None):
+            raise ValueError(f"case must be 'upper', 'lower', 'title' or None, got {case!r}")
+        self.case = case
+        self.raw = pd.Index([], dtype=object)        # Raw values seen so far ...
+        self.raw_codes = np.empty(0, dtype=np.int64)  # ... and the clean code of each
+        self.categories = pd.Index([], dtype=object)  # Clean values, in order of first appearance
+        self.cached = None                            # Mode, set by the first non-empty chunk
+
+    def _normalize(self, values):
+        clean = pd.Index(values, dtype=object).astype(str).str.strip()
+        if self.case:
+            clean = getattr(clean.str, self.case)()
+        return pd.Index(clean, dtype=object)
+
+    def __call__(self, values):
+        codes, uniques = pd.factorize(np.asarray(values, dtype=object))
+        if self.cached is None and len(codes):
+            self.cached = len(uniques) <= HIGH_CARDINALITY * len(codes)
+        if not self.cached:
+            # Mostly-unique values (IDs): a cache would only grow, so just clean
+            # this chunk's distinct values once each and gather them
+            return np.append(self._normalize(uniques).to_numpy(), np.nan)[codes]
+
+        position = self.raw.get_indexer(uniques)
+
+        new = position < 0
+        if new.any():
+            # Only values never seen before get the string treatment
+            new_raw = pd.Index(uniques[new], dtype=object)
+            clean = self._normalize(new_raw)
+            unseen = clean[self.categories.get_indexer(clean) < 0].unique()
+            self.categories = self.categories.append(unseen)
+            self.raw = self.raw.append(new_raw)
+            self.raw_codes = np.concatenate([self.raw_codes, self.categories.get_indexer(clean)])
+            position = self.raw.get_indexer(uniques)
+
+        # One lookup per distinct raw value, then a vectorized gather for the rows
+        lookup = np.append(self.raw_codes[position], -1)
+        return pd.Categorical.from_codes(lookup[codes], categories=self.categories)
+
+
+class CleaningPipeline:
+    """
+    The lesson's cleaning steps for exports of any size.
+
+    strings: {column: 'upper' | 'lower' | 'title' | None} (always stripped)
+    numeric: columns to convert with pd.to_numeric (unparseable -> NaN, counted)
+    dedupe:  keep only the first row per value of this column (None to keep all)
+    """
+
+    def __init__(self, strings=None, numeric=None, dedupe=DEDUPE_COLUMN):
+        strings = STRING_RULES if strings is None else strings
+        self.numeric = NUMERIC_COLUMNS if numeric is None else list(numeric)
+        self.dedupe = dedupe
+        self._normalizers = {col: _StringNormalizer(case) for col, case in strings.items()}
+        self._seen = pd.Index([], dtype=object)     # Cleaned dedupe keys of every row kept so far
+        self.meter = Throughput()
+        self.rows_out = 0
+        self.duplicates = 0
+        self.bad_numbers = 0
+
+    def clean(self, chunk):
+        """Clean one DataFrame chunk (raw vendor column names are fine)."""
+        df = chunk.copy(deep=False)
+        df.columns = normalize_column_names(df.columns)
+        rows_in = len(df)
+
+        for col, normalize in self._normalizers.items():
+            if col in df.columns:
+                df[col] = normalize(df[col])
+
+        for col in self.numeric:
+            if col in df.columns:
+                numbers = pd.to_numeric(df[col], errors='coerce')
+                self.bad_numbers += int((numbers.isna() & df[col].notna()).sum())
+                df[col] = numbers
+
+        if self.dedupe in df.columns:
+            df = self._drop_seen(df)
+
+        if 'tds_output' in df.columns:
+            df['tds_category'] = tds_category(df['tds_output'])
+
+        self.meter.add(rows_in)
+        self.rows_out += len(df)
+        return df
+
+    def _drop_seen(self, df):
+        """drop_duplicates(keep='first') across every chunk cleaned so far; counts every row dropped."""
+        # Plain cleaned values whatever the column's dtype (categorical or strings)
+        keys = df[self.dedupe].astype(object)
+        new = (~keys.duplicated(keep='first') & ~keys.isin(self._seen)).to_numpy()
+        self._seen = self._seen.append(pd.Index(keys.to_numpy()[new], dtype=object))
+        self.duplicates += len(df) - int(new.sum())
+        return df[new]
+
+    def clean_chunks(self, chunks):
+        """Yield the cleaned version of every chunk."""
+        for chunk in chunks:
+            yield self.clean(chunk)
+
+    def clean_csv(self, path, chunksize=CHUNK_ROWS, **read_csv_kwargs):
+        """Read an export in chunks (all columns as strings, like a raw dump) and clean it."""
+        read_csv_kwargs.setdefault('dtype', str)
+        with pd.read_csv(path, chunksize=chunksize, **read_csv_kwargs) as reader:
+            yield from self.clean_chunks(reader)
+
+    def report(self):
+        """Throughput plus what the cleaning did: rows in/out, duplicates, unparseable numbers."""
+        report = self.meter.report()
+        report.update(rows_out=self.rows_out, duplicates=self.duplicates,
+                      bad_numbers=self.bad_numbers,
+                      distinct_raw_strings={col: len(n.raw)
+                                            for col, n in self._normalizers.items()})
+        return report
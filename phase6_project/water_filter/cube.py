@@ -0,0 +1,324 @@
+"""
+Materialized region x month x membrane_status aggregate cube.
+
+phase3_pandas/04_grouping_aggregation.ipynb answers dashboard questions with
+df.groupby('region').agg({...}) - a full scan of the raw readings per
+question. AggregateCube scans each reading once, when it arrives, and keeps
+per-cell totals that every later question is answered from:
+
+    readings                      count per cell
+    sum / count / min / max       per measure column (-> mean, min, max)
+    distinct filters              HyperLogLog registers per cell
+
+Sums, counts, min and max roll up exactly: the North total is the sum of the
+North cells over every month and status. Averages don't - the mean of
+monthly means is not the yearly mean - so the cube keeps sums and counts and
+divides at query time.
+
+A distinct count doesn't roll up by adding either: a filter read in March
+and April must count once for the spring. Each cell keeps a HyperLogLog
+sketch (4096 one-byte registers holding the longest run of leading zeros
+seen among hashed filter IDs); the union of cells is the element-wise max
+of their registers, so any roll-up gets a distinct count with ~1.6%
+standard error.
+
+    cube = AggregateCube()
+    for chunk in iter_readings_csv('water_filter_readings.csv'):
+        cube.update(chunk)                                   # incremental
+    cube.rollup('region')                                    # like groupby('region').agg
+    cube.rollup(['month', 'membrane_status'], where={'region': 'North'})
+    cube.save('fleet_cube.npz')
+
+A query touches a few hundred cells, never the raw data, so it takes a few
+milliseconds however many readings went in.
+
+Laravel parallel: a summary table kept up to date by a model observer,
+instead of a GROUP BY over the readings table on every dashboard load.
+"""
+
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from .pipeline import TARGET
+
+
+DIMENSIONS = ('region', 'month', 'membrane_status')
+TIME_COLUMN = 'reading_date'           # 'month' is derived from this column
+MEASURES = {
+    'tds_output': ('mean', 'min', 'max'),
+    'flow_rate_lpm': ('mean',),
+    TARGET: ('mean',),                 # Maintenance rate
+}
+DISTINCT_COLUMN = 'filter_id'
+HLL_PRECISION = 12                     # 2**12 registers per cell: ~1.6% standard error
+STATS = ('sum', 'count', 'min', 'max')
+
+
+# -----------------------------------------------------------------------------
+# HYPERLOGLOG - vectorized over all cells at once
+# -----------------------------------------------------------------------------
+def _hll_positions(values, precision):
+    """(register, rank) per value: register from the top hash bits, rank = leading zeros + 1 of the rest."""
+    values = pd.Series(values)
+    if isinstance(values.dtype, pd.CategoricalDtype):
+        # Hash each category once, rows pick theirs up by code
+        hashes = pd.util.hash_array(values.cat.categories.to_numpy())[values.cat.codes.to_numpy()]
+    else:
+        hashes = pd.util.hash_array(values.to_numpy())
+    register = (hashes >> np.uint64(64 - precision)).astype(np.int64)
+    low = (hashes & np.uint64(0xFFFFFFFF)).astype(np.float64)      # Exact in float64
+    _, exponent = np.frexp(low)                                    # low < 2**exponent
+    rank = (33 - exponent).astype(np.uint8)                        # 33 when low == 0
+    return register, rank
+
+
+def _hll_estimate(registers):
+    """Distinct-count estimate from (..., m) registers, with the small-range correction."""
+    m = registers.shape[-1]
+    alpha = 0.7213 / (1 + 1.079 / m)
+    raw = alpha * m * m / np.ldexp(1.0, -registers.astype(np.int64)).sum(axis=-1)
+    zeros = (registers == 0).sum(axis=-1)
+    with np.errstate(divide='ignore'):
+        linear = m * np.log(m / np.maximum(zeros, 1))
+    return np.where((raw <= 2.5 * m) & (zeros > 0), linear, raw)
+
+
+# -----------------------------------------------------------------------------
+# THE CUBE
+# -----------------------------------------------------------------------------
+class AggregateCube:
+    """
+    Incrementally maintained aggregates over the cross product of dimensions.
+
+    dimensions: columns to group by; 'month' is derived from time_column
+    measures:   {column: stats to report}, stats from 'mean', 'min', 'max',
+                'sum', 'count'
+    distinct:   column whose distinct values are counted per cell (None: off)
+
+    Labels are added as they appear (a new month extends the cube). Rows with
+    a missing dimension value are not added, and counted in rows_skipped.
+    """
+
+    def __init__(self, dimensions=DIMENSIONS, measures=None, distinct=DISTINCT_COLUMN,
+                 time_column=TIME_COLUMN, precision=HLL_PRECISION):
+        self.dimensions = list(dimensions)
+        self.measures = {col: tuple(stats) for col, stats in (measures or MEASURES).items()}
+        self.distinct = distinct
+        self.time_column = time_column
+        self.precision = precision
+        self.labels = {dim: pd.Index([]) for dim in self.dimensions}
+        self.readings = np.zeros((0,) * len(self.dimensions), dtype=np.int64)
+        self.totals = {(col, stat): self._empty(stat, self.readings.shape)
+                       for col in self.measures for stat in STATS}
+        self.registers = (np.zeros(self.readings.shape + (2 ** precision,), dtype=np.uint8)
+                          if distinct else None)
+        self.rows_skipped = 0
+
+    @staticmethod
+    def _empty(stat, shape):
+        fill = {'min': np.inf, 'max': -np.inf}.get(stat, 0)
+        return np.full(shape, fill, dtype=np.float64)
+
+    @property
+    def shape(self):
+        return self.readings.shape
+
+    # -------------------------------------------------------------------------
+    # UPDATING
+    # -------------------------------------------------------------------------
+    def _dimension_values(self, chunk, dim):
+        if dim == 'month':
+            # First day of the month, in a resolution pandas can index
+            return chunk[self.time_column].to_numpy().astype('datetime64[M]').astype('datetime64[s]')
+        return chunk[dim]
+
+    def _grow(self, new_labels):
+        """Extend the labels of each dimension, padding every array to the new shape."""
+        old_shape = self.shape
+        for dim, labels in new_labels.items():
+            self.labels[dim] = self.labels[dim].append(pd.Index(labels))
+        shape = tuple(len(self.labels[dim]) for dim in self.dimensions)
+        if shape == old_shape:
+            return
+        inner = tuple(slice(0, n) for n in old_shape)
+
+        def padded(array, fill, trailing=()):
+            grown = np.full(shape + trailing, fill, dtype=array.dtype)
+            grown[inner] = array
+            return grown
+
+        self.readings = padded(self.readings, 0)
+        for (col, stat), array in self.totals.items():
+            self.totals[col, stat] = padded(array, self._empty(stat, ()).item())
+        if self.registers is not None:
+            self.registers = padded(self.registers, 0, self.registers.shape[-1:])
+
+    def _cells(self, chunk):
+        """Flat cell index of every row (-1 when a dimension value is missing)."""
+        positions, new_labels = [], {}
+        for dim in self.dimensions:
+            codes, uniques = pd.factorize(self._dimension_values(chunk, dim))
+            position = self.labels[dim].get_indexer(uniques)
+            unseen = position < 0
+            if unseen.any():
+                new_labels[dim] = np.asarray(uniques)[unseen]
+                position[unseen] = len(self.labels[dim]) + np.arange(unseen.sum())
+            positions.append(np.append(position, -1)[codes])
+        self._grow(new_labels)
+
+        valid = np.logical_and.reduce([p >= 0 for p in positions])
+        cells = np.full(len(chunk), -1, dtype=np.int64)
+        cells[valid] = np.ravel_multi_index([p[valid] for p in positions], self.shape)
+        return cells
+
+    def update(self, chunk):
+        """Add one chunk of readings to the cube."""
+        cells = self._cells(chunk)
+        valid = cells >= 0
+        self.rows_skipped += int((~valid).sum())
+        cells = cells[valid]
+        size = self.readings.size
+
+        self.readings += np.bincount(cells, minlength=size).reshape(self.shape)
+        for col in self.measures:
+            values = chunk[col].to_numpy(np.float64)[valid]
+            observed = ~np.isnan(values)
+            flat = {stat: self.totals[col, stat].reshape(-1) for stat in STATS}
+            flat['sum'] += np.bincount(cells[observed], values[observed], minlength=size)
+            flat['count'] += np.bincount(cells[observed], minlength=size)
+            np.minimum.at(flat['min'], cells[observed], values[observed])
+            np.maximum.at(flat['max'], cells[observed], values[observed])
+
+        if self.registers is not None:
+            register, rank = _hll_positions(chunk[self.distinct][valid], self.precision)
+            m = self.registers.shape[-1]
+            np.maximum.at(self.registers.reshape(-1), cells * m + register, rank)
+        return self
+
+    def merge(self, other):
+        """Fold another cube with the same dimensions and measures into this one."""
+        self._grow({dim: other.labels[dim][self.labels[dim].get_indexer(other.labels[dim]) < 0]
+                    for dim in self.dimensions})
+        where = np.ix_(*[self.labels[dim].get_indexer(other.labels[dim]) for dim in self.dimensions])
+        self.readings[where] += other.readings
+        for col in self.measures:
+            self.totals[col, 'sum'][where] += other.totals[col, 'sum']
+            self.totals[col, 'count'][where] += other.totals[col, 'count']
+            self.totals[col, 'min'][where] = np.minimum(self.totals[col, 'min'][where],
+                                                        other.totals[col, 'min'])
+            self.totals[col, 'max'][where] = np.maximum(self.totals[col, 'max'][where],
+                                                        other.totals[col, 'max'])
+        if self.registers is not None:
+            self.registers[where] = np.maximum(self.registers[where], other.registers)
+        self.rows_skipped += other.rows_skipped
+        return self
+
+    # -------------------------------------------------------------------------
+    # QUERYING
+    # -------------------------------------------------------------------------
+    def _label_index(self, dim):
+        labels = self.labels[dim]
+        if dim == 'month':
+            return pd.DatetimeIndex(labels).to_period('M').rename(dim)
+        return pd.Index(labels, name=dim)
+
+    def _selection(self, where):
+        """Index arrays per axis for the where= filter (all labels when not filtered)."""
+        selection = []
+        for dim in self.dimensions:
+            labels = self._label_index(dim)
+            if dim not in (where or {}):
+                selection.append(np.arange(len(labels)))
+                continue
+            wanted = where[dim]
+            wanted = [wanted] if np.isscalar(wanted) or isinstance(wanted, pd.Period) else list(wanted)
+            if dim == 'month':
+                wanted = [pd.Period(w, freq='M') for w in wanted]
+            position = labels.get_indexer(wanted)
+            if (position < 0).any():
+                raise KeyError(f"unknown {dim} label(s): {[w for w, p in zip(wanted, position) if p < 0]}")
+            selection.append(position)
+        return np.ix_(*selection), selection
+
+    def rollup(self, by=(), where=None):
+        """
+        Aggregates grouped by the `by` dimensions, summed over the others.
+
+        by=() gives the fleet total. where={dimension: label or labels}
+        restricts the cube first, e.g. where={'month': ['2025-06', '2025-07']}.
+        Returns a DataFrame with readings, filters and <measure>_<stat> columns;
+        empty groups are left out.
+        """
+        by = [by] if isinstance(by, str) else list(by)
+        unknown = set(by) - set(self.dimensions)
+        if unknown:
+            raise ValueError(f"unknown dimension(s) {sorted(unknown)}; the cube has {self.dimensions}")
+        block, selection = self._selection(where)
+        # Dimensions not grouped by are summed over
+        axes = tuple(i for i, dim in enumerate(self.dimensions) if dim not in by)
+        kept = [dim for dim in self.dimensions if dim in by]
+        order = [kept.index(dim) for dim in by]         # Reduced axes -> the order of `by`
+
+        def reduce(array, func):
+            return np.transpose(func(array[block], axis=axes), order).reshape(-1)
+
+        readings = reduce(self.readings, np.sum)
+        columns = {'readings': readings}
+        if self.registers is not None:
+            registers = self.registers[block].max(axis=axes)
+            registers = np.transpose(registers, order + [registers.ndim - 1])
+            columns['filters'] = np.round(_hll_estimate(registers.reshape(len(readings), -1))).astype(np.int64)
+        for col, stats in self.measures.items():
+            total = {'sum': reduce(self.totals[col, 'sum'], np.sum),
+                     'count': reduce(self.totals[col, 'count'], np.sum),
+                     'min': reduce(self.totals[col, 'min'], np.min),
+                     'max': reduce(self.totals[col, 'max'], np.max)}
+            with np.errstate(invalid='ignore', divide='ignore'):
+                total['mean'] = total['sum'] / total['count']
+            for stat in stats:
+                columns[f'{col}_{stat}'] = total[stat]
+
+        if by:
+            index = pd.MultiIndex.from_product(
+                [self._label_index(dim)[selection[self.dimensions.index(dim)]] for dim in by])
+            if len(by) == 1:
+                index = index.get_level_values(0)
+        else:
+            index = pd.Index(['all'])
+        result = pd.DataFrame(columns, index=index)
+        result = result[result['readings'] > 0]
+        return result.sort_index() if by else result
+
+    # -------------------------------------------------------------------------
+    # STORAGE - one .npz file, a few MB whatever the number of readings
+    # -------------------------------------------------------------------------
+    def save(self, path):
+        arrays = {f'labels__{dim}': labels.to_numpy().astype('datetime64[s]' if dim == 'month' else str)
+                  for dim, labels in self.labels.items()}
+        arrays['readings'] = self.readings
+        arrays.update({f'total__{col}__{stat}': array for (col, stat), array in self.totals.items()})
+        if self.registers is not None:
+            arrays['registers'] = self.registers
+        arrays['rows_skipped'] = np.array(self.rows_skipped)
+        np.savez(Path(path), **arrays)
+
+    @classmethod
+    def load(cls, path, measures=None, **options):
+        """Load a saved cube; pass the same measures / options it was created with."""
+        with np.load(Path(path)) as data:
+            dimensions = [name.split('__', 1)[1] for name in data.files if name.startswith('labels__')]
+            if 'registers' in data.files:
+                options['precision'] = int(np.log2(data['registers'].shape[-1]))
+            else:
+                options['distinct'] = None
+            cube = cls(dimensions, measures, **options)
+            cube.labels = {dim: pd.Index(data[f'labels__{dim}']) for dim in dimensions}
+            cube.readings = data['readings']
+            cube.totals = {(col, stat): data[f'total__{col}__{stat}']
+                           for col in cube.measures for stat in STATS}
+            if cube.registers is not None:
+                cube.registers = data['registers']
+            cube.rows_skipped = int(data['rows_skipped'])
+        return cube
@@ -0,0 +1,339 @@
+"""
+Single-pass, out-of-core EDA for the readings dataset.
+
+The 02 notebook's EDA calls df.describe(), df[numeric_cols].corr(),
+value_counts() and groupby(...)['maintenance_needed'].mean() - each one a
+full scan of a DataFrame that has to fit in memory. EDASummary reads the
+dataset once, chunk by chunk, and keeps only small accumulators:
+
+    counts, mean, variance, min, max   StreamingScaler (Chan's update)
+    approximate quantiles              QuantileSketch (log-spaced buckets)
+    correlation matrix                 co-moment matrix (Chan's update)
+    value counts / per-group rates     dicts of counts and target sums
+
+Every accumulator merges exactly, so summaries of separate chunks, files or
+worker processes combine into the summary of the whole dataset:
+
+    summary = summarize_csv('../data/water_filter_readings.csv')
+    summary.describe()                    # like df.describe()
+    summary.corr()                        # like df[numeric_cols].corr()
+    summary.value_counts('region')        # like df['region'].value_counts()
+    summary.group_rate('membrane_status') # like df.groupby(...)[target].mean()
+
+Memory depends on the chunk size and the number of columns, not on rows.
+"""
+
+import copy
+import math
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from .pipeline import TARGET
+from .scaling import StreamingScaler
+from .schema import iter_readings_csv
+from .storage import iter_columnar, list_partitions
+
+
+GROUP_COLUMNS = ('membrane_status', 'region')
+QUANTILE_ACCURACY = 0.01         # Relative error of the approximate quantiles
+
+
+# -----------------------------------------------------------------------------
+# APPROXIMATE QUANTILES
+# -----------------------------------------------------------------------------
+class QuantileSketch:
+    """
+    Mergeable quantile sketch with bounded relative error (DDSketch-style).
+
+    Values are counted in log-spaced buckets: bucket i holds values in
+    (gamma**(i-1), gamma**i], gamma = (1 + alpha) / (1 - alpha). Any quantile
+    is then within alpha (1% by default) of the true value, and two sketches
+    merge by adding their bucket counts. Sensor values span a few orders of
+    magnitude, so a column needs a few hundred buckets whatever the row count.
+    """
+
+    MIN_MAGNITUDE = 1e-9         # Smaller |values| count as zero
+
+    def __init__(self, alpha=QUANTILE_ACCURACY):
+        self.alpha = alpha
+        self.gamma = (1 + alpha) / (1 - alpha)
+        self._log_gamma = math.log(self.gamma)
+        self.positive = {}
+        self.negative = {}
+        self.zeros = 0
+        self.count = 0
+
+    def update(self, values):
+        values = np.asarray(values, dtype=np.float64)
+        values = values[~np.isnan(values)]
+        small = np.abs(values) < self.MIN_MAGNITUDE
+        self.zeros += int(small.sum())
+        self._add(self.positive, values[~small & (values > 0)])
+        self._add(self.negative, -values[~small & (values < 0)])
+        self.count += len(values)
+        return self
+
+    def _add(self, buckets, magnitudes):
+        if not len(magnitudes):
+            return
+        keys = np.ceil(np.log(magnitudes) / self._log_gamma).astype(np.int64)
+        low = keys.min()
+        counts = np.bincount(keys - low)
+        for offset in np.flatnonzero(counts):
+            key = int(low + offset)
+            buckets[key] = buckets.get(key, 0) + int(counts[offset])
+
+    def merge(self, other):
+        if other.alpha != self.alpha:
+            raise ValueError(f"Can't merge sketches with alpha {self.alpha} and {other.alpha}")
+        for mine, theirs in ((self.positive, other.positive), (self.negative, other.negative)):
+            for key, count in theirs.items():
+                mine[key] = mine.get(key, 0) + count
+        self.zeros += other.zeros
+        self.count += other.count
+        return self
+
+    def _value(self, key):
+        """Representative value of a bucket (relative error <= alpha for the whole bucket)."""
+        return 2 * self.gamma ** key / (self.gamma + 1)
+
+    def quantile(self, q):
+        """Approximate q-quantile (0 <= q <= 1), like np.quantile's 'lower' rank."""
+        if not self.count:
+            return np.nan
+        rank = min(max(q, 0), 1) * (self.count - 1)
+        seen = 0
+        for key in sorted(self.negative, reverse=True):     # Most negative first
+            seen += self.negative[key]
+            if seen > rank:
+                return -self._value(key)
+        seen += self.zeros
+        if seen > rank:
+            return 0.0
+        for key in sorted(self.positive):
+            seen += self.positive[key]
+            if seen > rank:
+                return self._value(key)
+
+
+# -----------------------------------------------------------------------------
+# CORRELATION
+# -----------------------------------------------------------------------------
+class CoMoments:
+    """Mergeable mean vector and co-moment matrix -> covariance / correlation."""
+
+    def __init__(self):
+        self.count = 0
+        self.mean = None
+        self.comoment = None
+
+    def update(self, X):
+        """Add complete rows of X (rows with any NaN are skipped, like listwise deletion)."""
+        complete = ~np.isnan(X).any(axis=1)
+        if not complete.all():
+            X = X[complete]
+        if not len(X):
+            return self
+        mean = X.mean(axis=0)
+        centered = X - mean
+        return self._combine(len(X), mean, centered.T @ centered)
+
+    def merge(self, other):
+        if not other.count:
+            return self
+        return self._combine(other.count, other.mean, other.comoment)
+
+    def _combine(self, count, mean, comoment):
+        if not self.count:
+            self.count, self.mean, self.comoment = count, mean.copy(), comoment.copy()
+            return self
+        total = self.count + count
+        delta = mean - self.mean
+        self.comoment += comoment + np.outer(delta, delta) * (self.count * count / total)
+        self.mean += delta * (count / total)
+        self.count = total
+        return self
+
+    def corr(self):
+        std = np.sqrt(np.diag(self.comoment))
+        with np.errstate(invalid='ignore', divide='ignore'):
+            return self.comoment / np.outer(std, std)
+
+
+# -----------------------------------------------------------------------------
+# THE SUMMARY
+# -----------------------------------------------------------------------------
+class EDASummary:
+    """
+    All of the notebook's EDA numbers from one pass over chunks.
+
+        summary = EDASummary()
+        for chunk in chunks:
+            summary.update(chunk)
+        summary.describe()
+
+    Numeric columns are taken from the first chunk. `counts` are the columns
+    to value_count; `groups` are the columns to compute target rates for.
+    """
+
+    def __init__(self, target=TARGET, groups=GROUP_COLUMNS, counts=None, alpha=QUANTILE_ACCURACY):
+        self.target = target
+        self.groups = list(groups)
+        self.counts = list(counts) if counts is not None else [target] + self.groups
+        self.alpha = alpha
+        self.rows = 0
+        self.numeric_columns = None
+
+    def update(self, chunk):
+        """Add one DataFrame chunk to every accumulator."""
+        if self.numeric_columns is None:
+            self.numeric_columns = list(chunk.select_dtypes(include=[np.number]).columns)
+            self.moments = StreamingScaler()
+            self.comoments = CoMoments()
+            self.sketches = {col: QuantileSketch(self.alpha) for col in self.numeric_columns}
+            self.value_counts_ = {col: {} for col in self.counts}
+            self.group_sums = {col: {} for col in self.groups}
+
+        X = chunk[self.numeric_columns].to_numpy(np.float64)
+        self.moments.partial_fit(X)
+        self.comoments.update(X)
+        for j, col in enumerate(self.numeric_columns):
+            self.sketches[col].update(X[:, j])
+
+        for col in self.counts:
+            _add_counts(self.value_counts_[col], chunk[col].value_counts(sort=False).items())
+        for col in self.groups:
+            stats = chunk.groupby(col, observed=True)[self.target].agg(['sum', 'count'])
+            _add_counts(self.group_sums[col], ((key, (row['sum'], row['count']))
+                                               for key, row in stats.iterrows()))
+        self.rows += len(chunk)
+        return self
+
+    def merge(self, other):
+        """Fold in a summary of other rows (another chunk, file or worker)."""
+        if other.numeric_columns is None:
+            return self
+        if self.numeric_columns is None:
+            self.__dict__.update(copy.deepcopy(other.__dict__))
+            return self
+        if other.numeric_columns != self.numeric_columns:
+            raise ValueError("Can't merge summaries of different columns")
+        self.moments.merge(other.moments)
+        self.comoments.merge(other.comoments)
+        for col, sketch in other.sketches.items():
+            self.sketches[col].merge(sketch)
+        for col in self.counts:
+            _add_counts(self.value_counts_[col], other.value_counts_[col].items())
+        for col in self.groups:
+            _add_counts(self.group_sums[col], other.group_sums[col].items())
+        self.rows += other.rows
+        return self
+
+    # -------------------------------------------------------------------------
+    # RESULTS - same shapes as the pandas calls they replace
+    # -------------------------------------------------------------------------
+    def _check_updated(self):
+        if self.numeric_columns is None:
+            raise RuntimeError("EDASummary is empty - call update(chunk) first")
+
+    def describe(self):
+        """Like df.describe(): count, mean, std (ddof=1), min, approx 25/50/75%, max."""
+        self._check_updated()
+        m = self.moments
+        with np.errstate(invalid='ignore', divide='ignore'):
+            std = np.sqrt(m.var_ * m.n_samples_seen_ / (m.n_samples_seen_ - 1))
+        table = {
+            'count': m.n_samples_seen_,
+            'mean': m.mean_,
+            'std': std,
+            'min': m.data_min_,
+        }
+        for q in (0.25, 0.5, 0.75):
+            table[f'{q:.0%}'] = [self.sketches[col].quantile(q) for col in self.numeric_columns]
+        table['max'] = m.data_max_
+        return pd.DataFrame(table, index=self.numeric_columns).T
+
+    def quantile(self, column, q):
+        self._check_updated()
+        return self.sketches[column].quantile(q)
+
+    def corr(self):
+        """Like df[numeric_cols].corr() (Pearson, over rows with no missing values)."""
+        self._check_updated()
+        return pd.DataFrame(self.comoments.corr(), index=self.numeric_columns,
+                            columns=self.numeric_columns)
+
+    def value_counts(self, column):
+        self._check_updated()
+        counts = pd.Series(self.value_counts_[column], name='count', dtype=np.int64)
+        counts.index.name = column
+        return counts.sort_values(ascending=False, kind='stable')
+
+    def group_rate(self, column):
+        """Like df.groupby(column)[target].mean()."""
+        self._check_updated()
+        sums = self.group_sums[column]
+        rates = pd.Series({key: total / count for key, (total, count) in sums.items()},
+                          name=self.target, dtype=np.float64)
+        rates.index.name = column
+        return rates.sort_index()
+
+
+def _add_counts(totals, items):
+    """totals[key] += value for (key, value) pairs; tuples add element-wise."""
+    for key, value in items:
+        if isinstance(value, tuple):
+            old = totals.get(key, (0, 0))
+            totals[key] = (old[0] + value[0], old[1] + value[1])
+        else:
+            totals[key] = totals.get(key, 0) + int(value)
+
+
+# -----------------------------------------------------------------------------
+# ONE READ OVER A DATASET ON DISK
+# -----------------------------------------------------------------------------
+def summarize_chunks(chunks, **options):
+    """EDASummary of an iterable of DataFrame chunks."""
+    summary = EDASummary(**options)
+    for chunk in chunks:
+        summary.update(chunk)
+    return summary
+
+
+def summarize_csv(path, chunksize=500_000, **options):
+    """One chunked read of a readings CSV."""
+    return summarize_chunks(iter_readings_csv(path, chunksize), **options)
+
+
+def summarize_columnar(path, chunk_rows=500_000, **options):
+    """One chunked pass over a columnar dataset (memory-mapped, so pages are read once)."""
+    return summarize_chunks(iter_columnar(path, chunk_rows), **options)
+
+
+def _summarize_partition(path, chunk_rows, options):
+    return summarize_columnar(path, chunk_rows, **options)
+
+
+def summarize_partitioned(root, workers=1, chunk_rows=500_000, **options):
+    """
+    Summarize every partition of a partitioned dataset and merge the results.
+
+    Each partition is read `chunk_rows` rows at a time, so a big partition
+    doesn't have to fit in memory at once. With workers > 1 the partitions
+    are summarized in a process pool - the mergeable accumulators make the
+    parallel result the same as a serial pass.
+    """
+    paths = [p['path'] for p in list_partitions(root)]
+    summary = EDASummary(**options)
+    if workers <= 1:
+        parts = (_summarize_partition(path, chunk_rows, options) for path in paths)
+        for part in parts:
+            summary.merge(part)
+        return summary
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        for part in pool.map(_summarize_partition, paths, [chunk_rows] * len(paths),
+                             [options] * len(paths)):
+            summary.merge(part)
+    return summary
@@ -0,0 +1,135 @@
+"""
+Fused kernel for the Step 5 engineered features.
+
+The notebook's pandas version copies the DataFrame, then every feature
+allocates a temporary Series per operation:
+
+    ((tds_input - tds_output) / tds_input * 100).round(1)
+         tmp1        tmp2        tmp3       tmp4   -> new column
+
+At fleet scale that is several full-length arrays per feature. FeatureKernel
+runs the same operations block by block with NumPy's out= argument: each
+block is computed in a small scratch buffer that is reused for every feature
+and every block, then written into its column of one preallocated output
+array. Extra memory is a few blocks, whatever the number of rows.
+
+The scratch buffers are per thread (threading.local), so one kernel - or a
+fitted ReadingPreprocessor holding it - can be shared by scoring threads.
+
+The operations and dtypes are the same as the pandas code (float32 inputs
+are computed in float32), so the values are identical.
+"""
+
+import threading
+import time
+
+import numpy as np
+
+from .profiling import peak_rss_mb
+
+
+ENGINEERED_FEATURES = ['tds_reduction_pct', 'flow_per_pressure', 'usage_intensity', 'high_tds_input']
+BLOCK_ROWS = 65_536          # Rows per block: scratch stays in cache (~0.5 MB per float64 buffer)
+
+
+class FeatureKernel:
+    """
+    Write the four engineered features into a preallocated (n, 4) array.
+
+        kernel = FeatureKernel()
+        out = kernel(columns)              # columns: name -> 1-D array
+        kernel(columns, out=X[:, 15:])     # or straight into a feature matrix
+        kernel.report()                    # rows, rows/s, scratch and peak memory
+    """
+
+    def __init__(self, block_rows=BLOCK_ROWS):
+        self.block_rows = block_rows
+        self._local = threading.local()         # Scratch buffers, one set per thread
+        self._lock = threading.Lock()           # Guards the counters below
+        self.rows = 0
+        self.seconds = 0.0          # Time spent inside the kernel only
+
+    def __getstate__(self):
+        # Scratch buffers are a cache (and locks don't pickle) - keep only the settings
+        return {'block_rows': self.block_rows}
+
+    def __setstate__(self, state):
+        self.__init__(state['block_rows'])
+
+    @property
+    def _scratch(self):
+        """This thread's scratch buffers: (dtype, slot) -> array."""
+        try:
+            return self._local.scratch
+        except AttributeError:
+            self._local.scratch = {}
+            return self._local.scratch
+
+    def _buffer(self, dtype, slot, size):
+        """Reusable scratch array of `size` elements; slot tells apart two buffers of one dtype."""
+        scratch = self._scratch
+        key = (np.dtype(dtype), slot)
+        buf = scratch.get(key)
+        if buf is None or len(buf) < size:
+            buf = scratch[key] = np.empty(max(size, self.block_rows), dtype=dtype)
+        return buf[:size]
+
+    def __call__(self, columns, out=None):
+        tds_input, tds_output = columns['tds_input'], columns['tds_output']
+        flow, pressure = columns['flow_rate_lpm'], columns['pressure_psi']
+        usage, age = columns['total_usage_liters'], columns['filter_age_days']
+
+        started = time.perf_counter()
+        n = len(tds_input)
+        if out is None:
+            out = np.empty((n, len(ENGINEERED_FEATURES)), dtype=np.float64)
+
+        tds_dtype = np.result_type(tds_input, tds_output)
+        flow_dtype = np.result_type(flow, pressure)
+        age_dtype = np.result_type(age, 1)
+        usage_dtype = np.result_type(usage, age_dtype)
+
+        for start in range(0, n, self.block_rows):
+            stop = min(start + self.block_rows, n)
+            size = stop - start
+            tin = tds_input[start:stop]
+
+            # tds_reduction_pct = ((tds_input - tds_output) / tds_input * 100).round(1)
+            buf = self._buffer(tds_dtype, 0, size)
+            np.subtract(tin, tds_output[start:stop], out=buf)
+            np.divide(buf, tin, out=buf)
+            np.multiply(buf, 100, out=buf)
+            np.round(buf, 1, out=buf)
+            out[start:stop, 0] = buf
+
+            # flow_per_pressure = (flow_rate_lpm / pressure_psi).round(4)
+            buf = self._buffer(flow_dtype, 0, size)
+            np.divide(flow[start:stop], pressure[start:stop], out=buf)
+            np.round(buf, 4, out=buf)
+            out[start:stop, 1] = buf
+
+            # usage_intensity = (total_usage_liters / (filter_age_days + 1)).round(1)
+            days = self._buffer(age_dtype, 1, size)
+            np.add(age[start:stop], 1, out=days)
+            buf = self._buffer(usage_dtype, 0, size)
+            np.divide(usage[start:stop], days, out=buf)
+            np.round(buf, 1, out=buf)
+            out[start:stop, 2] = buf
+
+            # high_tds_input = (tds_input > 500).astype(int)
+            np.greater(tin, 500, out=out[start:stop, 3])
+
+        with self._lock:
+            self.rows += n
+            self.seconds += time.perf_counter() - started
+        return out
+
+    def report(self):
+        """Rows and rows/s over all calls so far, this thread's scratch memory and process peak RSS."""
+        return {
+            'rows': self.rows,
+            'seconds': round(self.seconds, 3),
+            'rows_per_s': round(self.rows / self.seconds) if self.seconds > 0 else 0,
+            'scratch_mb': round(sum(b.nbytes for b in self._scratch.values()) / 1024 ** 2, 2),
+            'peak_rss_mb': round(peak_rss_mb(), 1),
+        }
@@ -0,0 +1,236 @@
+"""
+Per-group missing-value imputation, fitted once and reused at scoring time.
+
+phase3_pandas/06_missing_data.ipynb fills NaNs with the column's mean() or
+median(), computed on whatever DataFrame is at hand. In production that is
+wrong twice: the scoring batch gets different fill values than training did,
+and a North filter is filled with an average that is mostly other regions.
+
+GroupImputer learns one fill value per (group, column) - e.g. the mean TDS
+per region - in a single streaming pass, plus a global value for groups it
+has never seen. The result is a small table:
+
+               tds_input  tds_output  flow_rate_lpm ...
+    East           651.2        61.0           1.71
+    North          352.8        55.9           1.72
+    ...
+    (global)       455.0        58.1           1.71
+
+Filling is a vectorized lookup: each row's group code picks its row of the
+table, so NaNs in a million-row batch are filled with one fancy-index per
+column, no per-row fillna.
+
+    imputer = GroupImputer(group='region').fit(train_df)   # or partial_fit per chunk
+    imputer.save('imputer.json')
+    ...
+    imputer = GroupImputer.load('imputer.json')
+    batch = imputer.transform(batch)                       # batch scoring
+    reading = imputer.transform_one(reading)               # single reading
+
+Laravel parallel: default attribute values ($attributes) - but per region,
+and read from the database instead of hard-coded.
+"""
+
+import json
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from .eda import QUANTILE_ACCURACY, QuantileSketch
+
+
+SENSOR_COLUMNS = [
+    'filter_age_days', 'tds_input', 'tds_output', 'flow_rate_lpm', 'pressure_psi',
+    'temperature_c', 'daily_usage_liters', 'total_usage_liters', 'sediment_filter_age_days',
+]
+STRATEGIES = ('mean', 'median')
+
+
+class GroupImputer:
+    """
+    Fill values per group and column, learned in one streaming pass.
+
+    strategy is 'mean' (exact) or 'median' (approximate, within 1%, from a
+    mergeable QuantileSketch), or a dict {column: strategy}. Groups whose
+    values were all missing, unseen groups and missing group labels fall
+    back to the global fill value.
+    """
+
+    def __init__(self, group='region', columns=None, strategy='mean'):
+        self.group = group
+        self.columns = list(columns or SENSOR_COLUMNS)
+        if isinstance(strategy, str):
+            strategy = {col: strategy for col in self.columns}
+        unknown = set(strategy.values()) - set(STRATEGIES)
+        if unknown:
+            raise ValueError(f"strategy must be one of {STRATEGIES}, got {sorted(unknown)}")
+        self.strategy = {col: strategy.get(col, 'mean') for col in self.columns}
+        self._reset()
+
+    def _reset(self):
+        self._sums = {}          # group -> (n_columns,) sums of observed values
+        self._counts = {}        # group -> (n_columns,) number of observed values
+        self._sketches = {}      # group -> [QuantileSketch] for the median columns
+        self._table = None
+
+    # -------------------------------------------------------------------------
+    # FITTING
+    # -------------------------------------------------------------------------
+    def partial_fit(self, chunk):
+        """Add one DataFrame chunk to the per-group statistics."""
+        self._table = None
+        values = chunk[self.columns].to_numpy(np.float64)
+        codes, groups = pd.factorize(chunk[self.group])
+        observed = ~np.isnan(values)
+        zeroed = np.where(observed, values, 0)
+
+        # Every row counts towards the global fallback, even without a group label
+        self._add(None, zeroed.sum(axis=0), observed.sum(axis=0))
+
+        # Per-group sums and counts: one bincount per column, whatever the number of groups
+        labelled = codes >= 0
+        group_codes = codes[labelled]
+        sums = np.column_stack([np.bincount(group_codes, weights=zeroed[labelled, j],
+                                            minlength=len(groups))
+                                for j in range(len(self.columns))])
+        counts = np.column_stack([np.bincount(group_codes, weights=observed[labelled, j],
+                                              minlength=len(groups))
+                                  for j in range(len(self.columns))])
+        for code, group in enumerate(groups):
+            self._add(group, sums[code], counts[code])
+
+        median_columns = [j for j, col in enumerate(self.columns) if self.strategy[col] == 'median']
+        if median_columns:
+            self._update_sketches(None, values)
+            order = np.argsort(group_codes, kind='stable')
+            bounds = np.searchsorted(group_codes[order], np.arange(len(groups) + 1))
+            rows = values[labelled][order]
+            for code, group in enumerate(groups):
+                self._update_sketches(group, rows[bounds[code]:bounds[code + 1]])
+        return self
+
+    def _add(self, group, sums, counts):
+        if group in self._sums:
+            self._sums[group] += sums
+            self._counts[group] += counts
+        else:
+            self._sums[group], self._counts[group] = sums.astype(np.float64), counts.astype(np.float64)
+            self._sketches[group] = {col: QuantileSketch(QUANTILE_ACCURACY)
+                                     for col, how in self.strategy.items() if how == 'median'}
+
+    def _update_sketches(self, group, values):
+        for col, sketch in self._sketches[group].items():
+            sketch.update(values[:, self.columns.index(col)])
+
+    def fit(self, df):
+        self._reset()
+        return self.partial_fit(df)
+
+    # -------------------------------------------------------------------------
+    # THE FILL TABLE
+    # -------------------------------------------------------------------------
+    def _fill_row(self, group):
+        with np.errstate(invalid='ignore', divide='ignore'):
+            row = self._sums[group] / self._counts[group]
+        for col, sketch in self._sketches[group].items():
+            row[self.columns.index(col)] = sketch.quantile(0.5)
+        return row
+
+    @property
+    def table(self):
+        """(n_groups + 1, n_columns) fill values; the last row is the global fallback."""
+        if self._table is None:
+            if None not in self._sums:
+                raise RuntimeError("GroupImputer is not fitted yet - call fit() or partial_fit() first")
+            self._groups = sorted(g for g in self._sums if g is not None)
+            self._positions = {g: i for i, g in enumerate(self._groups)}
+            fallback = self._fill_row(None)
+            rows = [self._fill_row(g) for g in self._groups] + [fallback]
+            table = np.vstack(rows)
+            # A group with no observed values for a column uses the global value
+            self._table = np.where(np.isnan(table), fallback, table)
+        return self._table
+
+    @property
+    def groups_(self):
+        """Group labels, in the order of the table's rows."""
+        self.table
+        return self._groups
+
+    @property
+    def fill_values_(self):
+        """The fill table as a DataFrame (groups x columns, plus the global row)."""
+        return pd.DataFrame(self.table, index=self.groups_ + ['(global)'], columns=self.columns)
+
+    # -------------------------------------------------------------------------
+    # FILLING
+    # -------------------------------------------------------------------------
+    def _row_codes(self, labels):
+        """Row of the table for each label; unknown or missing labels -> -1 (the global row)."""
+        return pd.Categorical(labels, categories=self.groups_).codes
+
+    def transform(self, df, copy=True):
+        """
+        Fill missing values in a DataFrame batch with its group's fill values.
+
+        A column missing from the batch entirely is added, filled per row.
+        """
+        table = self.table
+        if copy:
+            df = df.copy()
+        rows = self._row_codes(df[self.group])
+
+        for j, col in enumerate(self.columns):
+            if col not in df.columns:
+                df[col] = table[rows, j]
+                continue
+            values = df[col].to_numpy()
+            missing = pd.isna(values)
+            if not missing.any():
+                continue
+            filled = values.astype(np.float64) if values.dtype.kind != 'f' else values.copy()
+            filled[missing] = table[rows[missing], j]
+            df[col] = filled.astype(df[col].dtype) if df[col].dtype.kind == 'f' else filled
+        return df
+
+    def transform_one(self, reading):
+        """Copy of one reading dict with missing / None / NaN columns filled."""
+        table = self.table
+        row = table[self._positions.get(reading.get(self.group), -1)]
+        reading = dict(reading)
+        for j, col in enumerate(self.columns):
+            value = reading.get(col)
+            if value is None or value != value:            # None or NaN
+                reading[col] = float(row[j])
+        return reading
+
+    # -------------------------------------------------------------------------
+    # STORAGE - the fitted table is a few hundred numbers, so plain JSON
+    # -------------------------------------------------------------------------
+    def to_dict(self):
+        table = self.table
+        return {
+            'group': self.group,
+            'columns': self.columns,
+            'strategy': self.strategy,
+            'groups': [str(g) for g in self.groups_],
+            'fill_values': table[:-1].tolist(),
+            'global': table[-1].tolist(),
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        """Rebuild a fitted imputer (it can fill, but not continue fitting)."""
+        imputer = cls(data['group'], data['columns'], data['strategy'])
+        imputer._groups = data['groups']
+        imputer._positions = {g: i for i, g in enumerate(imputer._groups)}
+        imputer._table = np.array(data['fill_values'] + [data['global']], dtype=np.float64)
+        return imputer
+
+    def save(self, path):
+        Path(path).write_text(json.dumps(self.to_dict(), indent=2))
+
+    @classmethod
+    def load(cls, path):
+        return cls.from_dict(json.loads(Path(path).read_text()))
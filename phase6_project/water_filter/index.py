@@ -0,0 +1,115 @@
+"""
+Per-filter time-series index over the readings.
+
+`df[df.filter_id == 'WF0042']` scans every row to find one filter - O(N) per
+lookup, O(N x filters) to visit them all. FilterIndex sorts the readings once
+by (filter_id, reading_date) and keeps an offsets array:
+
+    rows of filter i  ==  data[offsets[i] : offsets[i + 1]]
+
+so one filter's history, or its last k readings, is a slice - no scan and no
+copy. Visiting every filter becomes one linear pass. A new batch of readings
+(the one passed to append_columnar) is merged in with index.append(batch).
+
+Laravel parallel: a database index on (filter_id, reading_date).
+"""
+
+import numpy as np
+import pandas as pd
+
+from .storage import concat_readings
+
+
+class FilterIndex:
+    """
+    Readings sorted by filter and date, plus where each filter starts.
+
+        index = FilterIndex(df)
+        index.history('WF0042')            # DataFrame slice, oldest first
+        index.last('WF0042', 5)            # Last 5 readings
+        index.values('tds_output', 'WF0042')   # NumPy view of one column
+        index = index.append(batch)        # Index over the old + new readings
+    """
+
+    def __init__(self, df):
+        filter_ids = df['filter_id'].array
+        if not isinstance(filter_ids, pd.Categorical):
+            filter_ids = pd.Categorical(filter_ids)
+        codes, categories = filter_ids.codes, filter_ids.categories
+        dates = df['reading_date'].to_numpy()
+
+        # The generator already writes filter-major, date-ordered rows: skip the sort then
+        if not self._is_sorted(codes, dates):
+            order = np.lexsort((dates, codes))
+            df = df.take(order)
+            codes = codes[order]
+        self.data = df.reset_index(drop=True)
+
+        counts = np.bincount(codes, minlength=len(categories))
+        self.offsets = np.zeros(len(categories) + 1, dtype=np.int64)
+        np.cumsum(counts, out=self.offsets[1:])
+
+        self.filter_ids = categories
+        self._position = {fid: i for i, fid in enumerate(categories)}
+        self._columns = {}
+
+    @staticmethod
+    def _is_sorted(codes, dates):
+        if len(codes) < 2:
+            return True
+        code_step = np.diff(codes.astype(np.int64))
+        same_filter = code_step == 0
+        return bool((code_step >= 0).all() and (np.diff(dates)[same_filter] >= np.timedelta64(0)).all())
+
+    def append(self, batch):
+        """
+        A new FilterIndex over these readings plus a batch of newer ones.
+
+        Both sides are already sorted, so a stable sort on the filter codes
+        alone (a radix sort, no date comparisons) puts each filter's new rows
+        after its old ones. A batch that goes back in time for some filter
+        falls back to the full (filter_id, reading_date) sort.
+        """
+        combined = concat_readings([self.data, FilterIndex(batch).data])
+        codes = pd.Categorical(combined['filter_id']).codes
+        dates = combined['reading_date'].to_numpy()
+        order = np.argsort(codes, kind='stable')
+        if not self._is_sorted(codes[order], dates[order]):
+            order = np.lexsort((dates, codes))
+        return FilterIndex(combined.take(order))
+
+    def __len__(self):
+        return len(self.filter_ids)
+
+    def __contains__(self, filter_id):
+        return filter_id in self._position
+
+    def bounds(self, filter_id):
+        """(start, stop) row positions of one filter in self.data."""
+        try:
+            i = self._position[filter_id]
+        except KeyError:
+            raise KeyError(f"Unknown filter_id {filter_id!r}") from None
+        return int(self.offsets[i]), int(self.offsets[i + 1])
+
+    def history(self, filter_id):
+        """All readings of one filter, oldest first (a slice of self.data)."""
+        start, stop = self.bounds(filter_id)
+        return self.data.iloc[start:stop]
+
+    def last(self, filter_id, k):
+        """The most recent k readings of one filter, oldest first."""
+        start, stop = self.bounds(filter_id)
+        return self.data.iloc[max(start, stop - k):stop]
+
+    def values(self, column, filter_id):
+        """One column of one filter's history as a NumPy view."""
+        if column not in self._columns:
+            self._columns[column] = self.data[column].to_numpy()
+        start, stop = self.bounds(filter_id)
+        return self._columns[column][start:stop]
+
+    def groups(self):
+        """Yield (filter_id, start, stop) for every filter - one linear pass."""
+        for i, filter_id in enumerate(self.filter_ids):
+            yield filter_id, int(self.offsets[i]), int(self.offsets[i + 1])
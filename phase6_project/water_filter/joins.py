@@ -0,0 +1,161 @@
+"""
+As-of join: attach each reading to the last maintenance visit before it.
+
+phase3_pandas/05_joining_data.ipynb joins filters and maintenance with
+pd.merge on filter_id. For readings that gives every (reading, visit) pair of
+a filter, and "the most recent visit on or before reading_date" would mean
+filtering that cross product and taking a max per reading - 40M readings x
+4 visits per filter is 160M intermediate rows.
+
+AsOfJoin never builds the pairs. The maintenance log is indexed once:
+
+    1. filter IDs become integer codes, visit dates become ranks among the
+       distinct visit dates
+    2. each visit gets one sortable int64 key:  code * (n_dates + 1) + rank
+    3. the visits are sorted by that key - i.e. by filter, then by date
+
+A reading's key is built the same way from its filter code and the number
+of visit dates <= its reading_date, so one np.searchsorted over the sorted
+keys lands on the filter's last visit on or before that date. If the slot
+found belongs to another filter, the reading has no earlier visit.
+That is a sorted merge per filter, for all filters at once: O(n log m) time,
+and memory for a few int64 arrays per chunk of readings.
+
+    join = AsOfJoin(maintenance)             # maintenance log, any order
+    for chunk in iter_readings_csv('water_filter_readings.csv'):
+        chunk = join.join(chunk)             # + service_date, service_type, cost,
+        ...                                  #   days_since_service
+    join.report()                            # rows/s, matched, index MB, peak RSS
+
+Same result as pd.merge_asof(readings, maintenance, by='filter_id', ...),
+which needs both sides sorted by date first and keeps the readings in date
+order; AsOfJoin keeps the readings in their own order and streams.
+
+Laravel parallel: a latestOfMany() relationship with a date constraint -
+resolved for a whole chunk with one query instead of one per reading.
+"""
+
+import time
+
+import numpy as np
+import pandas as pd
+
+from .profiling import peak_rss_mb
+
+
+DAYS_SINCE = 'days_since_service'
+
+
+class AsOfJoin:
+    """
+    Index a table of events once, then join it as-of onto readings.
+
+    by:        column shared by both sides (the filter ID)
+    left_on:   time column of the readings
+    right_on:  time column of the events; it is added to the output
+    columns:   event columns to carry over (default: all the others)
+    days_since: name of the added "days since the matched event" column
+               (NaN without one), or None to leave it out
+
+    Readings without an earlier event, with an unknown filter or with a
+    missing date get NA in the added columns.
+    """
+
+    def __init__(self, events, by='filter_id', left_on='reading_date', right_on='service_date',
+                 columns=None, days_since=DAYS_SINCE):
+        start = time.perf_counter()
+        self.by, self.left_on, self.right_on = by, left_on, right_on
+        self.days_since = days_since
+        if columns is None:
+            columns = [col for col in events.columns if col not in (by, right_on)]
+        self.columns = [right_on] + list(columns)
+
+        events = events[events[right_on].notna() & events[by].notna()]
+        codes, keys = pd.factorize(events[by])
+        self.keys_ = pd.Index(np.asarray(keys))
+        event_times = events[right_on].to_numpy()
+        rank, self.dates_ = self._rank(event_times)
+
+        # One sortable key per event: by filter, then by date
+        key = codes.astype(np.int64) * (len(self.dates_) + 1) + rank
+        order = np.argsort(key, kind='stable')
+        self._key = key[order]
+        self._codes = codes[order]
+        self._events = {col: events[col].array.take(order) for col in self.columns}
+
+        self.rows = 0
+        self.matched = 0
+        self.seconds = time.perf_counter() - start
+
+    @staticmethod
+    def _rank(times):
+        dates = np.unique(times)
+        return np.searchsorted(dates, times), dates
+
+    def _codes_of(self, keys):
+        """Event-side filter code of each key, -1 for filters without events."""
+        if isinstance(keys.dtype, pd.CategoricalDtype):
+            # Look up each category once instead of every row's string
+            lookup = np.append(self.keys_.get_indexer(keys.cat.categories), -1)
+            return lookup[keys.cat.codes.to_numpy()]
+        return self.keys_.get_indexer(keys.to_numpy())
+
+    def positions(self, keys, times):
+        """Row of the sorted events matched by each (key, time) pair, -1 where there is none."""
+        codes = self._codes_of(pd.Series(keys))
+        times = np.asarray(times)
+        # Compare in the finer of the two time units, so nothing gets truncated
+        unit = np.promote_types(self.dates_.dtype, times.dtype)
+        dates, times = self.dates_.astype(unit), times.astype(unit)
+
+        # Number of distinct event dates <= the reading's date, minus one
+        rank = np.searchsorted(dates, times, side='right') - 1
+        key = codes.astype(np.int64) * (len(dates) + 1) + rank
+
+        position = np.searchsorted(self._key, key, side='right') - 1
+        found = (codes >= 0) & ~np.isnat(times) & (position >= 0)
+        found[found] = self._codes[position[found]] == codes[found]
+        return np.where(found, position, -1)
+
+    def join(self, readings, copy=True):
+        """readings plus the matched event's columns (and days_since), in the readings' order."""
+        start = time.perf_counter()
+        if copy:
+            readings = readings.copy()
+        times = readings[self.left_on].to_numpy()
+        position = self.positions(readings[self.by], times)
+
+        for col, values in self._events.items():
+            readings[col] = values.take(position, allow_fill=True)
+        if self.days_since:
+            elapsed = times - readings[self.right_on].to_numpy()     # NaT where unmatched
+            readings[self.days_since] = elapsed / np.timedelta64(1, 'D')
+
+        self.rows += len(readings)
+        self.matched += int((position >= 0).sum())
+        self.seconds += time.perf_counter() - start
+        return readings
+
+    def join_chunks(self, chunks):
+        """Yield every chunk joined."""
+        for chunk in chunks:
+            yield self.join(chunk)
+
+    def report(self):
+        """Rows joined, time (indexing included), share matched, index size and process peak RSS."""
+        index_bytes = (self._key.nbytes + self._codes.nbytes + self.dates_.nbytes
+                       + sum(values.nbytes for values in self._events.values()))
+        return {
+            'rows': self.rows,
+            'events': len(self._key),
+            'seconds': round(self.seconds, 3),
+            'rows_per_s': round(self.rows / self.seconds) if self.seconds > 0 else 0,
+            'matched': self.matched,
+            'index_mb': round(index_bytes / 1024 ** 2, 1),
+            'peak_rss_mb': round(peak_rss_mb(), 1),
+        }
+
+
+def asof_join(readings, events, **kwargs):
+    """One-off AsOfJoin(events, **kwargs).join(readings)."""
+    return AsOfJoin(events, **kwargs).join(readings)
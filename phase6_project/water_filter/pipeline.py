@@ -0,0 +1,155 @@
+"""
+The modelling steps of 02_water_filter_ml_project.ipynb as plain functions.
+
+Same code as the notebook's Step 4 (preprocessing), Step 5 (feature
+engineering), Step 6 (models) and Step 9 (alert system), so benchmarks and
+scoring jobs run exactly what the notebook teaches.
+"""
+
+import warnings
+
+import numpy as np
+import pandas as pd
+from sklearn.ensemble import GradientBoostingClassifier, RandomForestClassifier
+from sklearn.linear_model import LogisticRegression
+from sklearn.tree import DecisionTreeClassifier
+
+
+TARGET = 'maintenance_needed'
+MEMBRANE_MAP = {'good': 0, 'degraded': 1, 'needs_replacement': 2}
+DROP_COLUMNS = ['filter_id', 'reading_date', 'membrane_status', 'tds_alert']
+
+TDS_SAFE_LIMIT = 100
+
+
+# -----------------------------------------------------------------------------
+# STEP 4: PREPROCESSING
+# -----------------------------------------------------------------------------
+def encode_readings(df):
+    """Encode membrane_status, one-hot encode region and drop non-feature columns."""
+    df_ml = df.copy()
+    df_ml['membrane_status_encoded'] = df_ml['membrane_status'].map(MEMBRANE_MAP).astype(int)
+    df_ml = pd.get_dummies(df_ml, columns=['region'], prefix='region')
+    return df_ml.drop(columns=DROP_COLUMNS)
+
+
+# -----------------------------------------------------------------------------
+# STEP 5: FEATURE ENGINEERING
+# -----------------------------------------------------------------------------
+def add_engineered_features(df_ml):
+    """Add the four engineered features to an encoded DataFrame (in place)."""
+    df_ml['tds_reduction_pct'] = ((df_ml['tds_input'] - df_ml['tds_output']) / df_ml['tds_input'] * 100).round(1)
+    df_ml['flow_per_pressure'] = (df_ml['flow_rate_lpm'] / df_ml['pressure_psi']).round(4)
+    df_ml['usage_intensity'] = (df_ml['total_usage_liters'] / (df_ml['filter_age_days'] + 1)).round(1)
+    df_ml['high_tds_input'] = (df_ml['tds_input'] > 500).astype(int)
+    return df_ml
+
+
+def split_features(df_ml):
+    """Features X and target y, like the start of Step 6."""
+    return df_ml.drop(columns=[TARGET]), df_ml[TARGET]
+
+
+# -----------------------------------------------------------------------------
+# STEP 6: MODELS
+# -----------------------------------------------------------------------------
+def make_models():
+    """The four candidate models compared in Step 6 (fresh, unfitted)."""
+    return {
+        'Logistic Regression': LogisticRegression(random_state=42, max_iter=1000),
+        'Decision Tree': DecisionTreeClassifier(random_state=42, max_depth=5),
+        'Random Forest': RandomForestClassifier(n_estimators=100, random_state=42),
+        'Gradient Boosting': GradientBoostingClassifier(n_estimators=100, random_state=42),
+    }
+
+
+# -----------------------------------------------------------------------------
+# STEP 9: ALERT SYSTEM
+# -----------------------------------------------------------------------------
+def check_filter_health(reading, model, feature_columns):
+    """
+    Check a water filter's health and return status.
+
+    Like a Laravel API endpoint:
+    GET /api/filter/{id}/health → {status, message, confidence}
+    """
+    # Rule-based TDS alert (immediate)
+    if reading.get('tds_output', 0) > TDS_SAFE_LIMIT:
+        return {
+            'status': 'ALERT',
+            'message': f'TDS output is {reading["tds_output"]} ppm - exceeds safe limit (100 ppm)!',
+            'action': 'Immediate maintenance required. Do not drink this water.'
+        }
+
+    # ML-based prediction
+    reading_df = pd.DataFrame([reading])[feature_columns]
+    probability = model.predict_proba(reading_df)[0][1]
+    return health_status(probability)
+
+
+def score_reading(reading, model, preprocessor, imputer=None):
+    """
+    check_filter_health for a raw reading (region, membrane_status, sensors).
+
+    The fitted preprocessor builds the feature row as a NumPy array, so there
+    is no one-row DataFrame and no hand-encoded region_* / engineered keys.
+    With a fitted GroupImputer, missing sensor values are filled first.
+    """
+    if imputer is not None:
+        reading = imputer.transform_one(reading)
+    if reading.get('tds_output', 0) > TDS_SAFE_LIMIT:
+        return check_filter_health(reading, model, preprocessor.feature_columns_)
+    probability = _predict_proba(model, preprocessor, preprocessor.transform_one(reading))[0]
+    return health_status(probability)
+
+
+def score_readings(df, model, preprocessor, imputer=None):
+    """
+    Health status of every raw reading in df: one transform + one predict_proba.
+
+    Returns a DataFrame (same index as df) with probability and status. With a
+    fitted GroupImputer, missing sensor values are filled per group first.
+    """
+    if imputer is not None:
+        df = imputer.transform(df)
+    probability = _predict_proba(model, preprocessor, preprocessor.transform(df))
+    tds_output = df['tds_output'].to_numpy()
+    status = np.select([tds_output > TDS_SAFE_LIMIT, probability > 0.7, probability > 0.4],
+                       ['ALERT', 'WARNING', 'WATCH'], default='OK')
+    return pd.DataFrame({'probability': probability, 'status': status}, index=df.index)
+
+
+def _predict_proba(model, preprocessor, X):
+    """Maintenance probability for a feature array, after checking the column order."""
+    fitted_columns = getattr(model, 'feature_names_in_', None)
+    if fitted_columns is not None:
+        if list(fitted_columns) != preprocessor.feature_columns_:
+            raise ValueError("model was trained on different feature columns than the preprocessor "
+                             f"produces: {list(fitted_columns)} vs {preprocessor.feature_columns_}")
+        # Same columns in the same order - the bare array is safe to pass
+        with warnings.catch_warnings():
+            warnings.filterwarnings('ignore', message='X does not have valid feature names')
+            return model.predict_proba(X)[:, 1]
+    return model.predict_proba(X)[:, 1]
+
+
+def health_status(probability):
+    """Turn a maintenance probability into the alert system's status dict."""
+    if probability > 0.7:
+        return {
+            'status': 'WARNING',
+            'message': f'Maintenance likely needed soon ({probability:.0%} confidence)',
+            'action': 'Schedule maintenance within 1 week.'
+        }
+    elif probability > 0.4:
+        return {
+            'status': 'WATCH',
+            'message': f'Filter showing early signs of wear ({probability:.0%} confidence)',
+            'action': 'Monitor closely. Check again in a few days.'
+        }
+    else:
+        return {
+            'status': 'OK',
+            'message': f'Filter is working well ({1-probability:.0%} confidence)',
+            'action': 'No action needed.'
+        }
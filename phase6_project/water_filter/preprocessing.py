@@ -0,0 +1,129 @@
+"""
+Fitted preprocessing: raw readings -> the model's feature matrix.
+
+Step 4/5 of the notebook encode membrane_status, one-hot encode region, drop
+columns and add engineered features on a copied DataFrame. Scoring code then
+has to rebuild the same columns by hand (region_East, tds_reduction_pct, ...)
+in the same order, or the model silently reads the wrong features.
+
+ReadingPreprocessor learns the feature layout once from the training data and
+writes raw readings straight into a float64 NumPy matrix in that layout:
+
+    preprocessor = ReadingPreprocessor().fit(df)
+    X = preprocessor.transform(df)              # batch: (n, k) array
+    x = preprocessor.transform_one(reading)     # one raw dict: (1, k) array
+    preprocessor.feature_columns_               # == X.columns of the notebook
+
+Laravel parallel: a Form Request / API Resource - one class owns the mapping
+between the raw payload and what the app works with.
+"""
+
+import numpy as np
+import pandas as pd
+
+from .features import ENGINEERED_FEATURES, FeatureKernel
+from .pipeline import DROP_COLUMNS, MEMBRANE_MAP, TARGET
+
+
+class ReadingPreprocessor:
+    """Encode + feature-engineer raw readings into the notebook's X.columns order."""
+
+    def fit(self, df):
+        """Learn the numeric columns, the region categories and the output column order."""
+        skip = set(DROP_COLUMNS) | {'region', TARGET}
+        self.numeric_columns_ = [c for c in df.columns if c not in skip]
+        self.numeric_dtypes_ = {c: df[c].to_numpy().dtype for c in self.numeric_columns_}
+
+        # get_dummies order: category order for categoricals, sorted otherwise
+        region = df['region']
+        if isinstance(region.dtype, pd.CategoricalDtype):
+            self.regions_ = list(region.cat.categories)
+        else:
+            self.regions_ = sorted(region.dropna().unique())
+
+        self.feature_columns_ = (self.numeric_columns_ + ['membrane_status_encoded']
+                                 + [f'region_{r}' for r in self.regions_]
+                                 + ENGINEERED_FEATURES)
+
+        n_numeric = len(self.numeric_columns_)
+        self._membrane_col = n_numeric
+        self._region_col = n_numeric + 1
+        self._engineered_col = self._region_col + len(self.regions_)
+        self._membrane_values = np.array(list(MEMBRANE_MAP.values()), dtype=np.float64)
+        self._membrane_position = {s: i for i, s in enumerate(MEMBRANE_MAP)}
+        self._region_position = {r: i for i, r in enumerate(self.regions_)}
+        self._kernel = FeatureKernel()
+        return self
+
+    def fit_transform(self, df):
+        return self.fit(df).transform(df)
+
+    # -------------------------------------------------------------------------
+    # BATCH PATH
+    # -------------------------------------------------------------------------
+    def transform(self, df):
+        """Raw readings DataFrame -> float64 array of shape (len(df), len(feature_columns_))."""
+        self._check_fitted()
+        n = len(df)
+        X = np.empty((n, len(self.feature_columns_)), dtype=np.float64)
+
+        columns = {}
+        for j, column in enumerate(self.numeric_columns_):
+            columns[column] = df[column].to_numpy()
+            X[:, j] = columns[column]
+
+        membrane = self._codes(df['membrane_status'], list(MEMBRANE_MAP), 'membrane_status')
+        X[:, self._membrane_col] = self._membrane_values[membrane]
+
+        region = self._codes(df['region'], self.regions_, 'region')
+        dummies = X[:, self._region_col:self._engineered_col]
+        dummies[:] = 0
+        dummies[np.arange(n), region] = 1
+
+        self._kernel(columns, out=X[:, self._engineered_col:])
+        return X
+
+    @staticmethod
+    def _codes(values, categories, name):
+        """Positions of values in categories; unknown values are an error, not a zero row."""
+        codes = pd.Categorical(values, categories=categories).codes
+        if (codes < 0).any():
+            unknown = sorted(set(pd.Series(values)[codes < 0].astype(str)))
+            raise ValueError(f"{name}: unknown values {unknown}")
+        return codes
+
+    # -------------------------------------------------------------------------
+    # SINGLE-READING PATH
+    # -------------------------------------------------------------------------
+    def transform_one(self, reading):
+        """One raw reading dict -> float64 array of shape (1, len(feature_columns_))."""
+        self._check_fitted()
+        x = np.zeros((1, len(self.feature_columns_)), dtype=np.float64)
+        row = x[0]
+
+        try:
+            for j, column in enumerate(self.numeric_columns_):
+                row[j] = reading[column]
+        except KeyError as e:
+            raise ValueError(f"reading is missing {e.args[0]!r}") from None
+
+        row[self._membrane_col] = self._membrane_values[
+            self._position(self._membrane_position, reading, 'membrane_status')]
+        row[self._region_col + self._position(self._region_position, reading, 'region')] = 1
+
+        # Step 5 features in the training dtypes (e.g. float32 from load_columnar) so a single
+        # reading gets exactly the values its row would get in transform()
+        columns = {c: x[:, j].astype(self.numeric_dtypes_[c]) for j, c in enumerate(self.numeric_columns_)}
+        self._kernel(columns, out=x[:, self._engineered_col:])
+        return x
+
+    @staticmethod
+    def _position(positions, reading, name):
+        value = reading.get(name)
+        if value not in positions:
+            raise ValueError(f"{name}: unknown value {value!r}")
+        return positions[value]
+
+    def _check_fitted(self):
+        if not hasattr(self, 'feature_columns_'):
+            raise RuntimeError("ReadingPreprocessor is not fitted yet - call fit(df) first")
@@ -0,0 +1,105 @@
+"""
+Small helpers for reporting speed and memory of pipeline stages.
+"""
+
+import resource
+import sys
+import threading
+import time
+
+
+def peak_rss_mb(children=False):
+    """
+    Peak resident memory of this process so far, in MB.
+
+    children=True gives the largest peak among finished child processes
+    (e.g. process-pool workers) instead.
+    """
+    who = resource.RUSAGE_CHILDREN if children else resource.RUSAGE_SELF
+    peak = resource.getrusage(who).ru_maxrss
+    # Linux reports kilobytes, macOS reports bytes
+    if sys.platform == 'darwin':
+        return peak / 1024 ** 2
+    return peak / 1024
+
+
+def current_rss_mb():
+    """Current resident memory of this process in MB (Linux; falls back to peak)."""
+    try:
+        with open('/proc/self/statm') as f:
+            pages = int(f.read().split()[1])
+    except OSError:
+        return peak_rss_mb()
+    return pages * resource.getpagesize() / 1024 ** 2
+
+
+class Throughput:
+    """
+    Count rows as they are processed and report rows/s and peak RSS.
+
+        meter = Throughput()
+        for chunk in chunks:
+            ...
+            meter.add(len(chunk))
+        print(meter.report())
+    """
+
+    def __init__(self):
+        self.rows = 0
+        self.start = time.perf_counter()
+
+    def add(self, rows):
+        self.rows += rows
+
+    @property
+    def seconds(self):
+        return time.perf_counter() - self.start
+
+    def report(self):
+        seconds = self.seconds
+        return {
+            'rows': self.rows,
+            'seconds': round(seconds, 3),
+            'rows_per_s': round(self.rows / seconds) if seconds > 0 else 0,
+            'peak_rss_mb': round(peak_rss_mb(), 1),
+        }
+
+
+class PeakRSS:
+    """
+    Peak resident memory while a block runs, sampled by a background thread.
+
+        with PeakRSS() as memory:
+            model.fit(X, y)
+        memory.growth_mb          # peak during the block minus RSS at its start
+
+    ru_maxrss (peak_rss_mb) only ever grows over the life of a process, so it
+    can't tell how much one step needed; sampling /proc can.
+    """
+
+    def __init__(self, interval=0.005):
+        self.interval = interval
+        self.start_mb = self.peak_mb = 0.0
+        self._stop = threading.Event()
+        self._thread = None
+
+    def _sample(self):
+        while not self._stop.wait(self.interval):
+            self.peak_mb = max(self.peak_mb, current_rss_mb())
+
+    def __enter__(self):
+        self.start_mb = self.peak_mb = current_rss_mb()
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._sample, daemon=True)
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._stop.set()
+        self._thread.join()
+        self.peak_mb = max(self.peak_mb, current_rss_mb())
+        return False
+
+    @property
+    def growth_mb(self):
+        return self.peak_mb - self.start_mb
@@ -0,0 +1,167 @@
+"""
+Streaming min-max / z-score scaling for data that doesn't fit in memory.
+
+phase2_numpy/04_broadcasting.ipynb normalizes an in-memory array:
+
+    (sensor_data - col_min) / (col_max - col_min)          # min-max
+    (sensor_data - col_mean) / col_std                     # z-score
+
+StreamingScaler collects the per-column min, max, mean and variance one chunk
+at a time instead, so the full dataset never has to be loaded. Each chunk is
+summarized on its own (count, mean, sum of squared deviations, min, max), and
+summaries are combined with Chan et al.'s parallel update:
+
+    delta = mean_b - mean_a
+    mean  = mean_a + delta * n_b / n
+    M2    = M2_a + M2_b + delta**2 * n_a * n_b / n
+
+That avoids the sum(x**2) - n * mean**2 shortcut, which loses all precision
+when the mean is large compared to the spread. Because chunks combine exactly
+like that, scalers fitted in separate worker processes merge into the same
+statistics as one pass over everything:
+
+    scaler = StreamingScaler()
+    for chunk in chunks:
+        scaler.partial_fit(chunk)
+    scaler.transform(batch)          # in place, by broadcasting
+
+NaNs are skipped in the statistics and stay NaN when transformed.
+
+Laravel parallel: like aggregating with withSum()/withAvg() in the query
+instead of loading every row into a Collection.
+"""
+
+import numpy as np
+
+
+class StreamingScaler:
+    """
+    Mergeable per-column statistics plus min-max or z-score scaling.
+
+    method='zscore' gives (x - mean) / std, method='minmax' gives
+    (x - min) / (max - min). Constant columns are scaled by 1, not 0.
+    """
+
+    METHODS = ('zscore', 'minmax')
+
+    def __init__(self, method='zscore'):
+        if method not in self.METHODS:
+            raise ValueError(f"method must be one of {self.METHODS}, got {method!r}")
+        self.method = method
+        self.n_samples_seen_ = None
+
+    # -------------------------------------------------------------------------
+    # FITTING
+    # -------------------------------------------------------------------------
+    def partial_fit(self, X):
+        """Add one chunk (2-D array or DataFrame) to the statistics."""
+        X = np.asarray(X, dtype=np.float64)
+        if X.ndim != 2:
+            raise ValueError(f"expected a 2-D chunk, got shape {X.shape}")
+
+        missing = np.isnan(X)
+        if not missing.any():
+            # Common case: no NaNs, so no masked copies of the chunk
+            count = np.full(X.shape[1], float(len(X)))
+            mean = X.mean(axis=0)
+            deviation = X - mean
+            np.square(deviation, out=deviation)
+            return self._combine(count, mean, deviation.sum(axis=0), X.min(axis=0), X.max(axis=0))
+
+        valid = ~missing
+        count = valid.sum(axis=0).astype(np.float64)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            total = np.where(valid, X, 0).sum(axis=0)
+            mean = total / count
+            deviation = np.where(valid, X - mean, 0)
+        np.square(deviation, out=deviation)
+        m2 = deviation.sum(axis=0)
+        low = np.where(valid, X, np.inf).min(axis=0)
+        high = np.where(valid, X, -np.inf).max(axis=0)
+
+        return self._combine(count, np.nan_to_num(mean), m2, low, high)
+
+    def fit(self, X):
+        self.n_samples_seen_ = None
+        return self.partial_fit(X)
+
+    def merge(self, other):
+        """Fold another scaler's statistics into this one (e.g. from a worker process)."""
+        if other.n_samples_seen_ is None:
+            return self
+        return self._combine(other.n_samples_seen_, other.mean_, other._m2,
+                             other.data_min_, other.data_max_)
+
+    def _combine(self, count, mean, m2, low, high):
+        if self.n_samples_seen_ is None:
+            self.n_samples_seen_ = count.copy()
+            self.mean_, self._m2 = mean.copy(), m2.copy()
+            self.data_min_, self.data_max_ = low.copy(), high.copy()
+            return self
+        if len(count) != len(self.mean_):
+            raise ValueError(f"expected {len(self.mean_)} columns, got {len(count)}")
+
+        total = self.n_samples_seen_ + count
+        with np.errstate(invalid='ignore', divide='ignore'):
+            share = np.where(total > 0, count / total, 0)
+        delta = mean - self.mean_
+        self.mean_ += delta * share
+        self._m2 += m2 + delta ** 2 * self.n_samples_seen_ * share
+        self.n_samples_seen_ = total
+        np.minimum(self.data_min_, low, out=self.data_min_)
+        np.maximum(self.data_max_, high, out=self.data_max_)
+        return self
+
+    # -------------------------------------------------------------------------
+    # STATISTICS
+    # -------------------------------------------------------------------------
+    @property
+    def var_(self):
+        """Population variance (ddof=0, like np.var and the lesson's .std())."""
+        with np.errstate(invalid='ignore', divide='ignore'):
+            return self._m2 / self.n_samples_seen_
+
+    @property
+    def std_(self):
+        return np.sqrt(self.var_)
+
+    def _offset_scale(self):
+        if self.n_samples_seen_ is None:
+            raise RuntimeError("StreamingScaler is not fitted yet - call partial_fit() first")
+        if self.method == 'zscore':
+            offset, scale = self.mean_, self.std_
+        else:
+            offset, scale = self.data_min_, self.data_max_ - self.data_min_
+        return offset, np.where((scale > 0) & np.isfinite(scale), scale, 1.0)
+
+    # -------------------------------------------------------------------------
+    # APPLYING
+    # -------------------------------------------------------------------------
+    def transform(self, X, copy=False):
+        """
+        Scale a batch. Float arrays are scaled in place (X -= offset; X /= scale,
+        the (n_columns,) statistics broadcast across the rows) unless copy=True.
+        """
+        X = self._writable(X, copy)
+        offset, scale = self._offset_scale()
+        X -= offset
+        X /= scale
+        return X
+
+    def inverse_transform(self, X, copy=False):
+        X = self._writable(X, copy)
+        offset, scale = self._offset_scale()
+        X *= scale
+        X += offset
+        return X
+
+    def fit_transform(self, X, copy=False):
+        return self.fit(X).transform(X, copy=copy)
+
+    @staticmethod
+    def _writable(X, copy):
+        """X itself when it can be scaled in place, else a float64 copy."""
+        if (copy or not isinstance(X, np.ndarray) or X.dtype.kind != 'f'
+                or not X.flags.writeable):
+            return np.array(X, dtype=np.float64)
+        return X
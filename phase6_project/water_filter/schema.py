@@ -0,0 +1,144 @@
+"""
+Column types for the water filter readings dataset.
+
+One place that says what each column *is*, so the CSV loader, the binary
+columnar store and the scoring code all agree. Like the $casts array on an
+Eloquent model.
+"""
+
+import pandas as pd
+
+from .generator import MEMBRANE_STATUSES, REGIONS
+
+
+# Compact dtypes: ages and flags fit in small ints, sensor values only carry
+# 1-2 decimals so float32 is plenty, repeated strings become categoricals.
+SCHEMA = {
+    'filter_id': 'category',
+    'region': 'category',
+    'reading_date': 'datetime64[s]',
+    'filter_age_days': 'int16',
+    'tds_input': 'float32',
+    'tds_output': 'float32',
+    'flow_rate_lpm': 'float32',
+    'pressure_psi': 'float32',
+    'temperature_c': 'float32',
+    'daily_usage_liters': 'float32',
+    'total_usage_liters': 'float32',
+    'sediment_filter_age_days': 'int16',
+    'membrane_status': 'category',
+    'maintenance_needed': 'int8',
+    'tds_alert': 'int8',
+}
+
+# Categoricals with a fixed set of allowed values. Other categoricals
+# (filter_id) grow as new filters join the fleet.
+KNOWN_CATEGORIES = {
+    'region': REGIONS,
+    'membrane_status': MEMBRANE_STATUSES,
+}
+
+
+def apply_schema(df):
+    """Cast a readings DataFrame to the compact SCHEMA dtypes."""
+    out = {}
+    for col, dtype in SCHEMA.items():
+        if dtype.startswith('datetime64'):
+            out[col] = pd.to_datetime(df[col]).astype(dtype)
+        else:
+            out[col] = df[col].astype(dtype)
+    return pd.DataFrame(out)
+
+
+def validate_readings(df):
+    """
+    Check that a batch of readings matches SCHEMA and cast it.
+
+    Raises ValueError naming the problem column, so a bad weekly batch is
+    rejected before anything is written. Returns the cast DataFrame.
+    """
+    missing = [col for col in SCHEMA if col not in df.columns]
+    extra = [col for col in df.columns if col not in SCHEMA]
+    if missing or extra:
+        raise ValueError(f"Batch columns don't match the schema: missing={missing}, extra={extra}")
+
+    for col, allowed in KNOWN_CATEGORIES.items():
+        unknown = set(df[col].dropna().astype(str).unique()) - set(allowed)
+        if unknown:
+            raise ValueError(f"Unknown {col} values {sorted(unknown)}, expected one of {allowed}")
+
+    nulls = [col for col in SCHEMA if df[col].isna().any()]
+    if nulls:
+        raise ValueError(f"Batch has missing values in {nulls}")
+
+    try:
+        return apply_schema(df)
+    except (ValueError, TypeError) as e:
+        raise ValueError(f"Batch can't be cast to the schema: {e}") from e
+
+
+# -----------------------------------------------------------------------------
+# CSV LOADING - apply the schema while parsing
+# -----------------------------------------------------------------------------
+def load_readings_csv(path, columns=None, **read_csv_kwargs):
+    """
+    Read a readings CSV straight into the compact SCHEMA dtypes.
+
+    The dtypes are passed to pd.read_csv, so strings are turned into
+    categoricals and numbers into int16/float32 while parsing - the full
+    64-bit / object version never exists in memory.
+    """
+    columns = columns or list(SCHEMA)
+    dtypes = {col: SCHEMA[col] for col in columns if not SCHEMA[col].startswith('datetime64')}
+    dates = [col for col in columns if SCHEMA[col].startswith('datetime64')]
+
+    df = pd.read_csv(path, usecols=columns, dtype=dtypes, parse_dates=dates, **read_csv_kwargs)
+    for col in dates:
+        df[col] = df[col].astype(SCHEMA[col])
+    return df[columns]
+
+
+def iter_readings_csv(path, chunksize=500_000, columns=None):
+    """
+    Yield a readings CSV as DataFrames of `chunksize` rows in the SCHEMA dtypes.
+
+    Like load_readings_csv, but only one chunk is in memory at a time.
+    """
+    columns = columns or list(SCHEMA)
+    dtypes = {col: SCHEMA[col] for col in columns if not SCHEMA[col].startswith('datetime64')}
+    dates = [col for col in columns if SCHEMA[col].startswith('datetime64')]
+
+    with pd.read_csv(path, usecols=columns, dtype=dtypes, parse_dates=dates,
+                     chunksize=chunksize) as reader:
+        for chunk in reader:
+            for col in dates:
+                chunk[col] = chunk[col].astype(SCHEMA[col])
+            yield chunk[columns]
+
+
+def memory_report(before, after, verbose=True):
+    """
+    Per-column memory of two versions of the same DataFrame.
+
+        memory_report(pd.read_csv(path), load_readings_csv(path))
+    """
+    before_mb = before.memory_usage(deep=True, index=False) / 1024 ** 2
+    after_mb = after.memory_usage(deep=True, index=False) / 1024 ** 2
+    report = pd.DataFrame({
+        'dtype_before': before.dtypes.astype(str),
+        'dtype_after': after.dtypes.astype(str),
+        'before_mb': before_mb,
+        'after_mb': after_mb,
+    }).loc[after.columns]
+    report['saved_pct'] = (1 - report['after_mb'] / report['before_mb']) * 100
+
+    total = pd.DataFrame({
+        'dtype_before': [''], 'dtype_after': [''],
+        'before_mb': [before_mb.sum()], 'after_mb': [after_mb.sum()],
+        'saved_pct': [(1 - after_mb.sum() / before_mb.sum()) * 100],
+    }, index=['TOTAL'])
+    report = pd.concat([report, total]).round({'before_mb': 2, 'after_mb': 2, 'saved_pct': 1})
+
+    if verbose:
+        print(report.to_string())
+    return report
@@ -0,0 +1,397 @@
+"""
+Binary columnar storage for the readings dataset.
+
+A dataset is a directory with one .npy file per column plus a schema.json:
+
+    water_filter_readings.columnar/
+        schema.json            rows, dtypes, category labels
+        filter_id.npy          category codes (int16/int32)
+        region.npy             category codes (int8)
+        reading_date.npy       datetime64[s]
+        tds_input.npy          float32
+        ...
+
+No text parsing and no dtype inference on load: each column is memory-mapped
+straight from disk, so opening even a huge file is nearly instant and pages
+are only read when a column is actually used.
+
+Laravel parallel: CSV is like re-running migrations + seeders on every
+request; this is like opening the already-built database.
+"""
+
+import io
+import json
+import os
+import shutil
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+from pandas.api.types import union_categoricals
+
+from .schema import SCHEMA, apply_schema, validate_readings
+
+
+FORMAT_VERSION = 1
+
+
+def save_columnar(df, path):
+    """Write a readings DataFrame as a columnar dataset directory."""
+    path = Path(path)
+    path.mkdir(parents=True, exist_ok=True)
+    df = apply_schema(df)
+
+    columns = {}
+    for col in SCHEMA:
+        series = df[col]
+        if isinstance(series.dtype, pd.CategoricalDtype):
+            # Codes keep pandas' own (smallest) code dtype so they load zero-copy
+            values = series.array.codes
+            columns[col] = {'dtype': 'category', 'codes': str(values.dtype),
+                            'categories': series.cat.categories.tolist()}
+        else:
+            values = series.to_numpy()
+            columns[col] = {'dtype': str(values.dtype)}
+        np.save(path / f'{col}.npy', values)
+
+    _write_schema(path, {'version': FORMAT_VERSION, 'rows': len(df), 'columns': columns})
+
+
+def _write_schema(path, schema):
+    """Replace schema.json atomically (write a temp file, then rename)."""
+    tmp = Path(path) / 'schema.json.tmp'
+    with open(tmp, 'w') as f:
+        json.dump(schema, f)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, Path(path) / 'schema.json')
+
+
+def read_schema(path):
+    """The schema.json of a columnar dataset."""
+    with open(Path(path) / 'schema.json') as f:
+        schema = json.load(f)
+    if schema['version'] != FORMAT_VERSION:
+        raise ValueError(f"Unsupported columnar format version {schema['version']} in {path}")
+    return schema
+
+
+def open_columnar(path, columns=None, mmap=True):
+    """
+    Open a columnar dataset as a dict of NumPy arrays.
+
+    With mmap=True (default) the arrays are read-only views of the files on
+    disk - nothing is copied. Categorical columns come back as their integer
+    codes; the labels are in read_schema(path)['columns'][col]['categories'].
+
+    Only the first schema['rows'] rows are returned: rows past that belong to
+    an append that never reached its schema.json write (see APPEND below).
+    """
+    path = Path(path)
+    schema = read_schema(path)
+    columns = columns or list(schema['columns'])
+    mode = 'r' if mmap else None
+    arrays = {}
+    for col in columns:
+        values = np.load(path / f'{col}.npy', mmap_mode=mode)
+        if len(values) < schema['rows']:
+            raise ValueError(f"{path}: {col} has {len(values):,} rows, schema.json says {schema['rows']:,}")
+        arrays[col] = values[:schema['rows']]
+    return arrays
+
+
+def load_columnar(path, columns=None, mmap=True):
+    """
+    Load a columnar dataset as a DataFrame with the compact SCHEMA dtypes.
+
+    The DataFrame wraps the memory-mapped arrays without copying them.
+    """
+    schema = read_schema(path)
+    arrays = open_columnar(path, columns, mmap)
+
+    data = {}
+    for col, values in arrays.items():
+        info = schema['columns'][col]
+        if info['dtype'] == 'category':
+            data[col] = pd.Categorical.from_codes(values, categories=info['categories'],
+                                                  validate=False)
+        else:
+            data[col] = values
+    return pd.DataFrame(data, copy=False)
+
+
+def iter_columnar(path, chunk_rows=500_000, columns=None):
+    """
+    Yield a columnar dataset as DataFrames of `chunk_rows` rows.
+
+    Each chunk is a slice of the memory-mapped columns, so only the pages of
+    the current chunk are read from disk.
+    """
+    df = load_columnar(path, columns)
+    for start in range(0, len(df), chunk_rows):
+        yield df.iloc[start:start + chunk_rows]
+
+
+# -----------------------------------------------------------------------------
+# PARTITIONED LAYOUT - one columnar dataset per region x month
+# -----------------------------------------------------------------------------
+#   water_filter_readings.partitioned/
+#       region=East/month=2025-01/      <- a normal columnar dataset
+#       region=East/month=2025-02/
+#       ...
+#       region=West/month=2025-12/
+#
+# The partition keys live in the directory names, so a filter like
+# region == 'North' and month in (6, 7) is answered by listing directories:
+# only the matching partitions are ever opened ("predicate pushdown").
+PARTITION_KEYS = ('region', 'year', 'month')
+
+_OPERATORS = {
+    '==': lambda a, b: a == b,
+    '!=': lambda a, b: a != b,
+    '<': lambda a, b: a < b,
+    '<=': lambda a, b: a <= b,
+    '>': lambda a, b: a > b,
+    '>=': lambda a, b: a >= b,
+    'in': lambda a, b: a in b,
+    'not in': lambda a, b: a not in b,
+}
+
+
+def partition_path(root, region, year, month):
+    """Directory of one region x month partition."""
+    return Path(root) / f'region={region}' / f'month={year:04d}-{month:02d}'
+
+
+def _partition_groups(df):
+    """Yield ((region, year, month), rows) for every partition present in df."""
+    dates = df['reading_date']
+    keys = [df['region'].astype(str), dates.dt.year.rename('year'), dates.dt.month.rename('month')]
+    for (region, year, month), part in df.groupby(keys, sort=True, observed=True):
+        yield (region, int(year), int(month)), part
+
+
+def write_partitioned(df, root, overwrite=False):
+    """
+    Write a readings DataFrame partitioned by region and reading_date month.
+
+    Returns the number of partitions written.
+    """
+    root = Path(root)
+    if root.exists() and any(root.iterdir()):
+        if not overwrite:
+            raise FileExistsError(f"{root} already exists (pass overwrite=True to replace it)")
+        shutil.rmtree(root)
+
+    df = apply_schema(df)
+    written = 0
+    for (region, year, month), part in _partition_groups(df):
+        # Each partition only stores the filter IDs it contains
+        part = part.assign(filter_id=part['filter_id'].cat.remove_unused_categories())
+        save_columnar(part, partition_path(root, region, year, month))
+        written += 1
+    return written
+
+
+def list_partitions(root):
+    """All partitions under root as dicts: {'region', 'year', 'month', 'path'}."""
+    partitions = []
+    for region_dir in sorted(Path(root).glob('region=*')):
+        for month_dir in sorted(region_dir.glob('month=*')):
+            year, month = month_dir.name.split('=', 1)[1].split('-')
+            partitions.append({
+                'region': region_dir.name.split('=', 1)[1],
+                'year': int(year),
+                'month': int(month),
+                'path': month_dir,
+            })
+    return partitions
+
+
+def _matches(partition, filters):
+    for key, op, value in filters:
+        if key not in PARTITION_KEYS:
+            raise ValueError(f"Can only filter on partition keys {PARTITION_KEYS}, got {key!r}")
+        if op not in _OPERATORS:
+            raise ValueError(f"Unknown operator {op!r}, use one of {list(_OPERATORS)}")
+        if not _OPERATORS[op](partition[key], value):
+            return False
+    return True
+
+
+def concat_readings(frames):
+    """
+    Concatenate readings DataFrames, keeping categoricals categorical.
+
+    Plain pd.concat falls back to object when category labels differ
+    (e.g. two partitions with different filter IDs); this unions them.
+    """
+    frames = [f for f in frames if len(f)]
+    if not frames:
+        return pd.DataFrame({col: pd.Series(dtype=dtype) for col, dtype in SCHEMA.items()})
+    if len(frames) == 1:
+        return frames[0]
+    combined = {}
+    for col in frames[0].columns:
+        parts = [f[col] for f in frames]
+        if isinstance(parts[0].dtype, pd.CategoricalDtype):
+            combined[col] = union_categoricals(parts)
+        else:
+            combined[col] = np.concatenate([p.to_numpy() for p in parts])
+    return pd.DataFrame(combined)
+
+
+def load_partitioned(root, filters=None, columns=None):
+    """
+    Load only the partitions that match `filters`.
+
+    filters is a list of (key, op, value) tuples on region / year / month,
+    all of which must hold:
+
+        load_partitioned(root, [('region', '==', 'North'), ('month', 'in', (6, 7))])
+    """
+    filters = filters or []
+    frames = [load_columnar(p['path'], columns)
+              for p in list_partitions(root) if _matches(p, filters)]
+    return concat_readings(frames)
+
+
+# -----------------------------------------------------------------------------
+# APPEND - add a new batch without rewriting history
+# -----------------------------------------------------------------------------
+# New readings are written onto the end of each column file. The .npy header
+# (which holds the row count) is padded by NumPy so it can be rewritten in
+# place, so an append only touches the new bytes plus a 128-byte header.
+# Category labels are extended in schema.json: existing codes stay valid and
+# new filter IDs get new codes at the end.
+#
+# schema.json is the commit point. Column files are grown first, one by one;
+# its 'rows' (and the new category labels) are only written once every column
+# has its new rows, with an atomic rename. Readers cut every column to
+# schema['rows'], so a crash half-way through an append leaves the dataset as
+# it was before the append, and the next append writes over the leftovers.
+# A column that has to be rewritten whole (wider codes, no room in the header)
+# is written to a temp file and renamed over the old one - never left half-written.
+def _code_dtype(num_categories):
+    """Smallest code dtype pandas uses for this many categories (keeps loads zero-copy)."""
+    for dtype in (np.int8, np.int16, np.int32):
+        if num_categories < np.iinfo(dtype).max:
+            return np.dtype(dtype)
+    return np.dtype(np.int64)
+
+
+_NPY_HEADERS = {
+    (1, 0): (np.lib.format.read_array_header_1_0, np.lib.format.write_array_header_1_0),
+    (2, 0): (np.lib.format.read_array_header_2_0, np.lib.format.write_array_header_2_0),
+}
+
+
+def _replace_npy(file, values):
+    """Rewrite a whole .npy file: write a temp file, then rename it over the old one."""
+    tmp = file.with_name(file.name + '.tmp')
+    with open(tmp, 'wb') as f:
+        np.save(f, values)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, file)
+
+
+def _append_npy(file, values, rows):
+    """
+    Write a 1-D array after the first `rows` rows of an .npy file, in place.
+
+    Anything past `rows` (left by an append that didn't commit) is overwritten.
+    Integer codes may be wider on disk than `values` (or need widening), which
+    is what category columns do as labels are added. Returns the stored dtype.
+    """
+    with open(file, 'r+b') as f:
+        version = np.lib.format.read_magic(f)
+        if version not in _NPY_HEADERS:
+            raise ValueError(f"{file}: unsupported .npy version {version}")
+        read_header, write_header = _NPY_HEADERS[version]
+        shape, fortran, dtype = read_header(f)
+        header_len = f.tell()
+        if fortran or len(shape) != 1 or shape[0] < rows:
+            raise ValueError(f"{file}: expected a 1-D column of at least {rows:,} rows, found {shape}")
+        integers = dtype.kind == values.dtype.kind == 'i'
+        if dtype != values.dtype and not integers:
+            raise ValueError(f"{file}: can't append {values.dtype} values to {dtype} column")
+
+        header = io.BytesIO()
+        write_header(header, {'descr': np.lib.format.dtype_to_descr(dtype),
+                              'fortran_order': False, 'shape': (rows + len(values),)})
+        if header.tell() == header_len and np.can_cast(values.dtype, dtype):
+            f.seek(header_len + rows * dtype.itemsize)
+            f.write(np.ascontiguousarray(values, dtype=dtype).tobytes())
+            f.truncate()
+            f.flush()
+            os.fsync(f.fileno())
+            f.seek(0)
+            f.write(header.getvalue())
+            return dtype
+
+    # Wider codes, or no room to grow the header in place - rewrite this column once
+    dtype = np.promote_types(dtype, values.dtype)
+    stored = np.load(file, mmap_mode='r')[:rows]
+    _replace_npy(file, np.concatenate([stored.astype(dtype), values.astype(dtype)]))
+    return dtype
+
+
+def append_columnar(path, batch):
+    """
+    Append a batch of readings to a columnar dataset (created if missing).
+
+    The batch is validated against SCHEMA first. Returns the new row count.
+    The append only counts once schema.json is rewritten, as its last step.
+    """
+    path = Path(path)
+    batch = validate_readings(batch)
+    if not (path / 'schema.json').exists():
+        save_columnar(batch, path)
+        return len(batch)
+
+    schema = read_schema(path)
+    if list(schema['columns']) != list(SCHEMA):
+        raise ValueError(f"Stored columns {list(schema['columns'])} don't match the schema")
+
+    rows = schema['rows']
+    for col, info in schema['columns'].items():
+        file = path / f'{col}.npy'
+        if info['dtype'] != 'category':
+            if np.dtype(info['dtype']) != batch[col].dtype:
+                raise ValueError(f"{col}: stored as {info['dtype']}, batch is {batch[col].dtype}")
+            _append_npy(file, batch[col].to_numpy(), rows)
+            continue
+
+        # Map the batch labels onto the stored codes, adding new labels at the end
+        categories = info['categories']
+        known = set(categories)
+        new = [c for c in batch[col].cat.categories if c not in known]
+        categories = categories + new
+        codes = pd.Categorical(batch[col], categories=categories).codes
+
+        # Too many labels for the old code width: the stored codes get widened once
+        code_dtype = _append_npy(file, codes.astype(_code_dtype(len(categories))), rows)
+        info.update(codes=str(code_dtype), categories=categories)
+
+    schema['rows'] = rows + len(batch)
+    _write_schema(path, schema)              # Commit point
+    return schema['rows']
+
+
+def append_partitioned(root, batch):
+    """
+    Append a batch of readings to a partitioned dataset.
+
+    Rows go onto the end of their region x month partition; partitions that
+    don't exist yet (a new month, a new region) are created. Cost depends on
+    the batch size, not on how much history is stored.
+    Returns the number of partitions touched.
+    """
+    batch = validate_readings(batch)
+    touched = 0
+    for (region, year, month), part in _partition_groups(batch):
+        part = part.assign(filter_id=part['filter_id'].cat.remove_unused_categories())
+        append_columnar(partition_path(root, region, year, month), part)
+        touched += 1
+    return touched
@@ -0,0 +1,208 @@
+"""
+Per-filter trend features, kept up to date one reading at a time.
+
+    tds_slope                  least-squares slope of tds_output (ppm/day) over
+                               the filter's last `window` readings (NaN until
+                               it has `window` readings, like rolling(window))
+    flow_delta                 flow_rate_lpm minus the filter's previous reading
+    days_since_sediment_reset  days since sediment_filter_age_days last dropped
+                               by more than RESET_DROP_DAYS (NaN before the
+                               first reset we have seen)
+
+compute_temporal_features(df) recomputes them for a whole history with one
+sort and array operations - no groupby/rolling. TemporalFeatures keeps a
+small state per filter (the last `window` dates and TDS values, the last flow
+rate, sediment age and reset date), so each new reading costs the same no
+matter how long the filter's history is:
+
+    state = TemporalFeatures(window=5)
+    history_features = state.initialize(history_df)    # bulk, vectorized
+    state.update(new_reading)                           # O(1) per reading
+
+Both paths run the same arithmetic on the same values, so streaming a
+history gives exactly the values of a full recompute.
+"""
+
+from collections import deque
+
+import numpy as np
+import pandas as pd
+
+
+TEMPORAL_FEATURES = ['tds_slope', 'flow_delta', 'days_since_sediment_reset']
+WINDOW = 5                   # Readings in the TDS slope window (~5 weeks)
+RESET_DROP_DAYS = 30         # Sediment age noise is a few days; a replacement drops it by ~100
+BLOCK_ROWS = 1_000_000       # Slope windows per block in the bulk path (bounds memory)
+
+
+def _day_numbers(dates):
+    """Dates (datetime64, Timestamps, strings) -> int64 days since 1970-01-01."""
+    return np.asarray(dates, dtype='datetime64[D]').astype(np.int64)
+
+
+def _slopes(days, tds):
+    """
+    Least-squares slope of each row of tds against the same row of days.
+
+    Both inputs are (m, window) float64 arrays with contiguous rows; the
+    streaming path passes a single row so both paths share this arithmetic.
+    """
+    dx = days - days.mean(axis=1, keepdims=True)
+    dy = tds - tds.mean(axis=1, keepdims=True)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return (dx * dy).sum(axis=1) / (dx * dx).sum(axis=1)
+
+
+# -----------------------------------------------------------------------------
+# FULL RECOMPUTE
+# -----------------------------------------------------------------------------
+def _sorted_arrays(df):
+    """Order that sorts df by (filter_id, reading_date), plus the sorted columns."""
+    filter_ids = df['filter_id'].array
+    if not isinstance(filter_ids, pd.Categorical):
+        filter_ids = pd.Categorical(filter_ids)
+    days = _day_numbers(df['reading_date'].to_numpy())
+    order = np.lexsort((days, filter_ids.codes))
+    return order, {
+        'codes': filter_ids.codes[order],
+        'days': days[order],
+        'tds': df['tds_output'].to_numpy(np.float64)[order],
+        'flow': df['flow_rate_lpm'].to_numpy(np.float64)[order],
+        'sediment': df['sediment_filter_age_days'].to_numpy(np.int64)[order],
+    }
+
+
+def _features_sorted(s, window):
+    """The three features for rows already sorted by (filter, date)."""
+    codes, days, tds, flow, sediment = s['codes'], s['days'], s['tds'], s['flow'], s['sediment']
+    n = len(codes)
+    same_filter = np.zeros(n, dtype=bool)
+    same_filter[1:] = codes[1:] == codes[:-1]
+
+    # --- flow_delta: difference to the previous row of the same filter ---
+    flow_delta = np.full(n, np.nan)
+    flow_delta[1:] = flow[1:] - flow[:-1]
+    flow_delta[~same_filter] = np.nan
+
+    # --- tds_slope: windows ending at row i that stay inside one filter ---
+    tds_slope = np.full(n, np.nan)
+    if n >= window:
+        day_windows = np.lib.stride_tricks.sliding_window_view(days.astype(np.float64), window)
+        tds_windows = np.lib.stride_tricks.sliding_window_view(tds, window)
+        full = codes[window - 1:] == codes[:n - window + 1]
+        for start in range(0, len(full), BLOCK_ROWS):
+            stop = min(start + BLOCK_ROWS, len(full))
+            slopes = _slopes(np.ascontiguousarray(day_windows[start:stop]),
+                             np.ascontiguousarray(tds_windows[start:stop]))
+            tds_slope[window - 1 + start:window - 1 + stop] = np.where(full[start:stop], slopes, np.nan)
+
+    # --- days_since_sediment_reset: carry the last reset position forward ---
+    reset = np.zeros(n, dtype=bool)
+    reset[1:] = same_filter[1:] & (sediment[1:] < sediment[:-1] - RESET_DROP_DAYS)
+    marker = np.where(reset | ~same_filter, np.arange(n), 0)
+    last = np.maximum.accumulate(marker) if n else marker
+    since_reset = np.where(reset[last], (days - days[last]).astype(np.float64), np.nan)
+
+    return tds_slope, flow_delta, since_reset
+
+
+def compute_temporal_features(df, window=WINDOW):
+    """Full recompute over a readings DataFrame; returns features aligned to df.index."""
+    order, s = _sorted_arrays(df)
+    result = np.empty((len(df), len(TEMPORAL_FEATURES)))
+    result[order] = np.column_stack(_features_sorted(s, window))
+    return pd.DataFrame(result, index=df.index, columns=TEMPORAL_FEATURES)
+
+
+# -----------------------------------------------------------------------------
+# INCREMENTAL STATE
+# -----------------------------------------------------------------------------
+class _FilterState:
+    __slots__ = ('days', 'tds', 'flow', 'sediment', 'reset_day')
+
+    def __init__(self, window):
+        self.days = deque(maxlen=window)
+        self.tds = deque(maxlen=window)
+        self.flow = None
+        self.sediment = None
+        self.reset_day = None
+
+
+class TemporalFeatures:
+    """
+    Per-filter state for the trend features.
+
+        state = TemporalFeatures()
+        state.initialize(history_df)     # features of the history, state at its end
+        state.update(reading)            # {'tds_slope': ..., 'flow_delta': ..., ...}
+
+    Readings of one filter must arrive in date order.
+    """
+
+    def __init__(self, window=WINDOW):
+        if window < 2:
+            raise ValueError("window must be at least 2 readings to fit a slope")
+        self.window = window
+        self._filters = {}
+
+    def __len__(self):
+        return len(self._filters)
+
+    def __contains__(self, filter_id):
+        return filter_id in self._filters
+
+    def initialize(self, df):
+        """
+        Bulk-load a history: compute its features vectorized and keep each
+        filter's tail as its state. Returns the features aligned to df.index.
+        """
+        order, s = _sorted_arrays(df)
+        features = _features_sorted(s, self.window)
+
+        filter_ids = df['filter_id'].to_numpy()[order]
+        ends = np.flatnonzero(np.append(s['codes'][1:] != s['codes'][:-1], True)) + 1 if len(df) else []
+        start = 0
+        for stop in ends:
+            state = self._filters[filter_ids[start]] = _FilterState(self.window)
+            tail = slice(max(start, stop - self.window), stop)
+            state.days.extend(s['days'][tail].tolist())
+            state.tds.extend(s['tds'][tail].tolist())
+            state.flow = float(s['flow'][stop - 1])
+            state.sediment = int(s['sediment'][stop - 1])
+            since = features[2][stop - 1]
+            state.reset_day = None if np.isnan(since) else int(s['days'][stop - 1] - since)
+            start = stop
+
+        result = np.empty((len(df), len(TEMPORAL_FEATURES)))
+        result[order] = np.column_stack(features)
+        return pd.DataFrame(result, index=df.index, columns=TEMPORAL_FEATURES)
+
+    def update(self, reading):
+        """Add one reading (a dict or row) and return its three features."""
+        filter_id = reading['filter_id']
+        day = int(_day_numbers(reading['reading_date']))
+        tds = float(reading['tds_output'])
+        flow = float(reading['flow_rate_lpm'])
+        sediment = int(reading['sediment_filter_age_days'])
+
+        state = self._filters.get(filter_id)
+        if state is None:
+            state = self._filters[filter_id] = _FilterState(self.window)
+        elif state.days and day < state.days[-1]:
+            raise ValueError(f"{filter_id}: reading for day {day} is older than the last one")
+
+        flow_delta = np.nan if state.flow is None else flow - state.flow
+        if state.sediment is not None and sediment < state.sediment - RESET_DROP_DAYS:
+            state.reset_day = day
+        state.days.append(day)
+        state.tds.append(tds)
+        state.flow = flow
+        state.sediment = sediment
+
+        tds_slope = np.nan
+        if len(state.days) == self.window:
+            tds_slope = float(_slopes(np.array([state.days], dtype=np.float64),
+                                      np.array([state.tds]))[0])
+        since_reset = np.nan if state.reset_day is None else float(day - state.reset_day)
+        return {'tds_slope': tds_slope, 'flow_delta': flow_delta,
+                'days_since_sediment_reset': since_reset}